@@ -6,38 +6,89 @@ https://github.com/binsoul/home-assistant-integration-foxinsights
 
 from __future__ import annotations
 
+import importlib
+import shutil
+import sys
+from collections.abc import Iterable
+from functools import partial
+from typing import TYPE_CHECKING
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .api import FoxInsightsApi
-from .const import CONF_EMAIL, CONF_PASSWORD, DOMAIN
-from .coordinator import FoxInsightsDataUpdateCoordinator
+from .const import (
+    CONF_ACCOUNTS,
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    CONF_RECORD_TRAFFIC,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from .scheduler import FoxInsightsPollScheduler
 
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
 ]
 
+# modules needed only for a running entry, relative to the integration package
+SETUP_MODULES = [
+    ".api",
+    ".cassette",
+    ".coordinator",
+    ".history",
+    ".scheduler",
+    ".services",
+    ".websocket",
+]
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up this integration."""
-    hass.data.setdefault(DOMAIN, {})
+    # The integration package is imported whenever the config flow or a platform is loaded.
+    # Everything needed only for a running entry is imported here to keep that cheap.
+    await async_import_modules(hass, SETUP_MODULES)
+
+    from .api import FoxInsightsApi
+    from .cassette import FoxInsightsCassetteRecorder
+    from .coordinator import FoxInsightsDataUpdateCoordinator
+    from .history import FoxInsightsHistoryArchive
+    from .scheduler import FoxInsightsPollScheduler
+    from .services import async_setup_services
+    from .websocket import async_setup_websocket
+
+    if DOMAIN not in hass.data:
+        hass.data[DOMAIN] = FoxInsightsPollScheduler(hass)
+    scheduler: FoxInsightsPollScheduler = hass.data[DOMAIN]
+
+    recorder = None
+    if entry.options.get(CONF_RECORD_TRAFFIC, False):
+        recorder = FoxInsightsCassetteRecorder(
+            hass.config.path(DOMAIN + "-" + entry.entry_id + ".cassette.jsonl")
+        )
 
     data_update_coordinator = FoxInsightsDataUpdateCoordinator(
         hass,
-        FoxInsightsApi(
-            entry.data[CONF_EMAIL],
-            entry.data[CONF_PASSWORD],
-            async_get_clientsession(hass),
-        ),
+        [
+            FoxInsightsApi(
+                account[CONF_EMAIL],
+                account[CONF_PASSWORD],
+                async_get_clientsession(hass),
+                recorder,
+            )
+            for account in _get_accounts(entry)
+        ],
+        FoxInsightsHistoryArchive(_get_archive_path(hass, entry)),
     )
 
-    hass.data[DOMAIN][entry.entry_id] = data_update_coordinator
-
-    await data_update_coordinator.async_config_entry_first_refresh()
+    await scheduler.async_run(data_update_coordinator.async_config_entry_first_refresh)
+    scheduler.async_add(entry.entry_id, data_update_coordinator)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await async_setup_services(hass)
+    async_setup_websocket(hass)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
@@ -45,18 +96,77 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload config entry."""
+    from .services import async_unload_services
+
     unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
+    scheduler: FoxInsightsPollScheduler = hass.data[DOMAIN]
     if unloaded:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        scheduler.async_remove(entry.entry_id)
 
-    if len(hass.data[DOMAIN]) == 0:
+    if len(scheduler.coordinators) == 0:
         hass.data.pop(DOMAIN)
+        await async_unload_services(hass)
 
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the history archive and the stored alerts of a deleted config entry."""
+    await async_import_modules(hass, [".alerts"])
+
+    from .alerts import get_alert_store
+
+    await hass.async_add_executor_job(
+        partial(shutil.rmtree, _get_archive_path(hass, entry), ignore_errors=True)
+    )
+    await get_alert_store(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
     await async_setup_entry(hass, entry)
+
+
+def _get_archive_path(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Return the directory of the history archive of a config entry."""
+    return hass.config.path(DOMAIN + "-" + entry.entry_id + ".history")
+
+
+async def async_import_modules(hass: HomeAssistant, names: Iterable[str]) -> None:
+    """Import modules of the integration in the executor.
+
+    Importing reads files and must not block the event loop. Afterwards the modules are imported from the module cache.
+
+    :param hass: The Home Assistant instance.
+    :param names: The names of the modules relative to the integration package, for example ".api".
+    """
+    missing = [name for name in names if __name__ + name not in sys.modules]
+    if missing:
+        await hass.async_add_executor_job(_import_modules, missing)
+
+
+def _import_modules(names: list[str]) -> None:
+    """Import modules of the integration.
+
+    :param names: The names of the modules relative to the integration package.
+    """
+    for name in names:
+        importlib.import_module(name, __name__)
+
+
+def _get_accounts(entry: ConfigEntry) -> list[dict[str, str]]:
+    """Return the credentials of all accounts of a config entry.
+
+    Entries created before multiple accounts were supported contain a single email and password.
+    """
+    if CONF_ACCOUNTS in entry.data:
+        return entry.data[CONF_ACCOUNTS]
+
+    return [
+        {
+            CONF_EMAIL: entry.data[CONF_EMAIL],
+            CONF_PASSWORD: entry.data[CONF_PASSWORD],
+        }
+    ]
@@ -0,0 +1,190 @@
+"""Incrementally maintained aggregates over all devices of a config entry."""
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+
+from .api import FoxInsightsDevice
+
+LOW_BATTERY_LEVELS = ("WARNING", "CRITICAL")
+
+
+@dataclass(frozen=True)
+class FoxInsightsDeviceContribution:
+    """Contribution of a single device to the aggregates."""
+
+    unit: str
+    quantity: int
+    capacity: int
+    days_reach: int | None
+    error: bool
+    low_battery: bool
+
+    @classmethod
+    def init_from_device(
+        cls, device: FoxInsightsDevice
+    ) -> FoxInsightsDeviceContribution:
+        """Create object from device."""
+        quantity = 0
+        capacity = 0
+        days_reach = None
+
+        try:
+            if device.fillLevelQuantity is not None:
+                quantity = int(device.fillLevelQuantity)
+                if (
+                    device.fillLevelPercent is not None
+                    and int(device.fillLevelPercent) > 0
+                ):
+                    capacity = round(quantity * 100 / int(device.fillLevelPercent))
+        except (TypeError, ValueError):
+            quantity = 0
+            capacity = 0
+
+        try:
+            if device.daysReach is not None:
+                days_reach = int(device.daysReach)
+        except (TypeError, ValueError):
+            days_reach = None
+
+        return cls(
+            "kg" if device.quantityUnit == "kg" else "L",
+            quantity,
+            capacity,
+            days_reach,
+            device.validationError not in (None, "NO_ERROR"),
+            device.batteryLevel in LOW_BATTERY_LEVELS,
+        )
+
+
+class FoxInsightsFleetAggregate:
+    """Aggregates over all devices which are updated from per-device changes only."""
+
+    def __init__(self) -> None:
+        """Initialize the object."""
+        self._contributions: dict[str, FoxInsightsDeviceContribution] = {}
+        self._devices: dict[str, int] = {}
+        self._quantity: dict[str, int] = {}
+        self._capacity: dict[str, int] = {}
+        self._capacity_quantity: dict[str, int] = {}
+        self._days_reach_heap: list[tuple[int, str]] = []
+        self.error_count: int = 0
+        self.low_battery_count: int = 0
+
+    def __len__(self) -> int:
+        """Return the number of aggregated devices."""
+        return len(self._contributions)
+
+    @property
+    def hwids(self) -> set[str]:
+        """Return the hardware IDs of all aggregated devices."""
+        return set(self._contributions)
+
+    @property
+    def units(self) -> list[str]:
+        """Return the quantity units of all aggregated devices."""
+        return sorted(self._quantity)
+
+    def update(self, device: FoxInsightsDevice) -> None:
+        """Replace the contribution of the given device.
+
+        :param device: The changed device.
+        """
+        contribution = FoxInsightsDeviceContribution.init_from_device(device)
+        previous = self._contributions.get(device.hwid)
+        if previous == contribution:
+            return
+
+        if previous is not None:
+            self._apply(previous, -1)
+
+        self._contributions[device.hwid] = contribution
+        self._apply(contribution, 1)
+
+        if contribution.days_reach is not None:
+            heapq.heappush(
+                self._days_reach_heap, (contribution.days_reach, device.hwid)
+            )
+            if len(self._days_reach_heap) > 2 * len(self._contributions) + 16:
+                self._rebuild_days_reach_heap()
+
+    def remove(self, hwid: str) -> None:
+        """Remove the contribution of a device which no longer exists.
+
+        :param hwid: The hardware ID of the device.
+        """
+        previous = self._contributions.pop(hwid, None)
+        if previous is not None:
+            self._apply(previous, -1)
+
+    def total_quantity(self, unit: str) -> int | None:
+        """Return the sum of the fill levels of all devices with the given unit.
+
+        :param unit: The quantity unit.
+        :return: The total quantity or None if there is no device with the unit.
+        """
+        return self._quantity.get(unit)
+
+    def fill_level_percent(self, unit: str) -> float | None:
+        """Return the capacity-weighted fill level of all devices with the given unit and a known capacity.
+
+        :param unit: The quantity unit.
+        :return: The fill level in percent or None if the capacity is unknown.
+        """
+        capacity = self._capacity.get(unit, 0)
+        if capacity <= 0:
+            return None
+
+        return round(self._capacity_quantity[unit] * 100 / capacity, 1)
+
+    def min_days_reach(self) -> int | None:
+        """Return the smallest days reach of all devices.
+
+        :return: The days reach or None if no device reports a days reach.
+        """
+        heap = self._days_reach_heap
+        while heap:
+            days_reach, hwid = heap[0]
+            contribution = self._contributions.get(hwid)
+            if contribution is not None and contribution.days_reach == days_reach:
+                return days_reach
+
+            heapq.heappop(heap)
+
+        return None
+
+    def _apply(self, contribution: FoxInsightsDeviceContribution, sign: int) -> None:
+        """Add or subtract a contribution from the totals.
+
+        :param contribution: The contribution of a device.
+        :param sign: 1 to add the contribution, -1 to subtract it.
+        """
+        unit = contribution.unit
+        self._devices[unit] = self._devices.get(unit, 0) + sign
+        self._quantity[unit] = (
+            self._quantity.get(unit, 0) + sign * contribution.quantity
+        )
+        self._capacity[unit] = (
+            self._capacity.get(unit, 0) + sign * contribution.capacity
+        )
+        if contribution.capacity > 0:
+            self._capacity_quantity[unit] = (
+                self._capacity_quantity.get(unit, 0) + sign * contribution.quantity
+            )
+        if self._devices[unit] == 0:
+            del self._devices[unit]
+            del self._quantity[unit]
+            del self._capacity[unit]
+            self._capacity_quantity.pop(unit, None)
+
+        self.error_count += sign * contribution.error
+        self.low_battery_count += sign * contribution.low_battery
+
+    def _rebuild_days_reach_heap(self) -> None:
+        """Drop outdated entries from the days reach heap."""
+        self._days_reach_heap = [
+            (contribution.days_reach, hwid)
+            for hwid, contribution in self._contributions.items()
+            if contribution.days_reach is not None
+        ]
+        heapq.heapify(self._days_reach_heap)
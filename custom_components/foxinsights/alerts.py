@@ -0,0 +1,179 @@
+"""Evaluation of alert thresholds for all devices of a config entry."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .api import FoxInsightsDevice
+from .const import (
+    ALERT_BATTERY_LEVELS,
+    ALERT_STORAGE_VERSION,
+    BATTERY_LEVELS,
+    CONF_ALERT_BATTERY_LEVEL,
+    CONF_ALERT_DAYS_REACH,
+    CONF_ALERT_FILL_LEVEL_PERCENT,
+    CONF_ALERT_VALIDATION_ERROR,
+    DOMAIN,
+)
+
+# option value -> battery level reported by the API
+BATTERY_LEVEL_OPTIONS = {
+    option: option.upper() for option in ALERT_BATTERY_LEVELS if option != "off"
+}
+
+
+@dataclass(frozen=True)
+class FoxInsightsAlertThresholds:
+    """Thresholds which trigger an alert. None disables the corresponding alert."""
+
+    fill_level_percent: int | None = None
+    days_reach: int | None = None
+    battery_level: str | None = None
+    validation_error: bool = False
+
+    @classmethod
+    def init_from_options(
+        cls, options: Mapping[str, Any]
+    ) -> FoxInsightsAlertThresholds:
+        """Create object from the options of a config entry. Thresholds of 0 and "off" disable the alert."""
+        battery_level = str(options.get(CONF_ALERT_BATTERY_LEVEL, "off")).lower()
+
+        return cls(
+            int(options.get(CONF_ALERT_FILL_LEVEL_PERCENT, 0)) or None,
+            int(options.get(CONF_ALERT_DAYS_REACH, 0)) or None,
+            BATTERY_LEVEL_OPTIONS.get(battery_level),
+            bool(options.get(CONF_ALERT_VALIDATION_ERROR, False)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Return if any alert is enabled."""
+        return (
+            self.fill_level_percent is not None
+            or self.days_reach is not None
+            or self.battery_level is not None
+            or self.validation_error
+        )
+
+
+def get_alert_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, list[str]]]:
+    """Return the store of the active alerts of a config entry.
+
+    :param hass: The Home Assistant instance.
+    :param entry_id: The ID of the config entry.
+    """
+    return Store(hass, ALERT_STORAGE_VERSION, DOMAIN + "." + entry_id + ".alerts")
+
+
+def _to_int(value: Any) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class FoxInsightsAlertEvaluator:
+    """Evaluator which remembers the active alerts of each device, so that each crossing is reported once.
+
+    The active alerts are persisted by the coordinator, so that a restart or reload does not report them again.
+    """
+
+    def __init__(self, thresholds: FoxInsightsAlertThresholds) -> None:
+        """Initialize the object."""
+        self.thresholds = thresholds
+        self.changed = False
+        self._active: dict[str, frozenset[str]] = {}
+
+    def restore(self, data: Mapping[str, Iterable[str]]) -> None:
+        """Restore the active alerts from stored data.
+
+        :param data: a dictionary mapping the hardware IDs to the names of their active alerts.
+        """
+        self._active = {hwid: frozenset(alerts) for hwid, alerts in data.items()}
+
+    def as_dict(self) -> dict[str, list[str]]:
+        """Return the active alerts in a format which can be stored as JSON."""
+        return {hwid: sorted(alerts) for hwid, alerts in self._active.items() if alerts}
+
+    def evaluate(self, devices: Iterable[FoxInsightsDevice]) -> list[dict[str, Any]]:
+        """Evaluate the thresholds for devices with new meterings in a single pass.
+
+        An alert is reported when a device crosses a threshold and again only after it went back above the threshold.
+
+        :param devices: The devices with new meterings.
+        :return: The alerts which became active.
+        """
+        if not self.thresholds.enabled:
+            return []
+
+        alerts: list[dict[str, Any]] = []
+        for device in devices:
+            crossed = self._get_crossed(device)
+            previous = self._active.get(device.hwid, frozenset())
+            active = frozenset(crossed)
+            if active != previous:
+                self._active[device.hwid] = active
+                self.changed = True
+
+            for alert, (value, threshold) in crossed.items():
+                if alert in previous:
+                    continue
+
+                alerts.append(
+                    {
+                        "hwid": device.hwid,
+                        "alert": alert,
+                        "value": value,
+                        "threshold": threshold,
+                        "metering_at": device.currentMeteringAt,
+                    }
+                )
+
+        return alerts
+
+    def _get_crossed(self, device: FoxInsightsDevice) -> dict[str, tuple[Any, Any]]:
+        """Return the thresholds which a device is currently below.
+
+        :param device: The device.
+        :return: a dictionary mapping the alerts to the value and the threshold.
+        """
+        thresholds = self.thresholds
+        crossed: dict[str, tuple[Any, Any]] = {}
+
+        if thresholds.fill_level_percent is not None:
+            percent = _to_int(device.fillLevelPercent)
+            if percent is not None and percent <= thresholds.fill_level_percent:
+                crossed["fill_level_percent"] = (percent, thresholds.fill_level_percent)
+
+        if thresholds.days_reach is not None:
+            days_reach = _to_int(device.daysReach)
+            if days_reach is not None and days_reach <= thresholds.days_reach:
+                crossed["days_reach"] = (days_reach, thresholds.days_reach)
+
+        if (
+            thresholds.battery_level is not None
+            and device.batteryLevel in BATTERY_LEVELS
+            and BATTERY_LEVELS.index(device.batteryLevel)
+            >= BATTERY_LEVELS.index(thresholds.battery_level)
+        ):
+            crossed["battery_level"] = (device.batteryLevel, thresholds.battery_level)
+
+        if thresholds.validation_error and device.validationError not in (
+            None,
+            "NO_ERROR",
+        ):
+            crossed["validation_error"] = (device.validationError, None)
+
+        return crossed
+
+    def remove(self, hwid: str) -> None:
+        """Forget the active alerts of a device which no longer exists.
+
+        :param hwid: The hardware ID of the device.
+        """
+        if self._active.pop(hwid, None):
+            self.changed = True
@@ -2,13 +2,30 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import socket
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
+from typing import Any
 
 import aiohttp
 import async_timeout
 
-from .const import API_URL, LOGGER, REQUEST_TIMEOUT
+from .cassette import FoxInsightsCassetteRecorder
+from .const import (
+    API_URL,
+    DECODE_EXECUTOR_THRESHOLD,
+    DEVICE_REQUEST_CONCURRENCY,
+    LOGGER,
+    MAX_RESPONSE_SIZE,
+    REQUEST_STATISTICS_SIZE,
+    RESPONSE_BUFFER_SIZE,
+    RESPONSE_CHUNK_SIZE,
+    REQUEST_TIMEOUT,
+)
+from .schema import FoxInsightsDeviceValidator
 
 
 @dataclass
@@ -24,21 +41,19 @@ class FoxInsightsDevice:
     fillLevelPercent: int | None
     fillLevelQuantity: int | None
     quantityUnit: str
+    account: str | None = None
 
-    @classmethod
-    def init_from_response(cls, response):
-        """Create object from response."""
-        return cls(
-            response.get("hwid"),
-            response.get("currentMeteringAt"),
-            response.get("nextMeteringAt"),
-            response.get("daysReach"),
-            response.get("validationError"),
-            response.get("batteryLevel"),
-            response.get("fillLevelPercent"),
-            response.get("fillLevelQuantity"),
-            response.get("quantityUnit"),
-        )
+
+@dataclass
+class FoxInsightsRequestStatistics:
+    """Timing and outcome of a single HTTP request."""
+
+    method: str
+    url: str
+    started_at: float
+    duration: float
+    retry: int
+    outcome: str
 
 
 class FoxInsightsApiError(Exception):
@@ -53,19 +68,64 @@ class FoxInsightsApiAuthenticationError(FoxInsightsApiError):
     """Exception to indicate an authentication error."""
 
 
+class FoxInsightsApiResponseTooLargeError(FoxInsightsApiError):
+    """Exception to indicate that a response exceeded the maximum size."""
+
+
+class FoxInsightsApiContentTypeError(FoxInsightsApiError):
+    """Exception to indicate that a response is not JSON."""
+
+
 class FoxInsightsApi:
     """FoxInsights API (https://github.com/foxinsights/customer-api)."""
 
-    def __init__(self, email: str, password: str, session: aiohttp.ClientSession):
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        session: aiohttp.ClientSession,
+        recorder: FoxInsightsCassetteRecorder | None = None,
+        decode_threshold: int = DECODE_EXECUTOR_THRESHOLD,
+        max_response_size: int = MAX_RESPONSE_SIZE,
+    ):
         """Initialize the object.
 
         :param email: The email of the user.
         :param password: The password of the user.
         :param session: The HTTP client session used for making requests.
+        :param recorder: The recorder used to record requests and responses (optional).
+        :param decode_threshold: The response size in bytes above which responses are decoded in the executor.
+        :param max_response_size: The maximum size of a response in bytes.
         """
         self._email = email
         self._password = password
         self._session = session
+        self._recorder = recorder
+        self._decode_threshold = decode_threshold
+        self._max_response_size = max_response_size
+        self.oversized_responses: int = 0
+        self.device_errors: dict[str, BaseException] = {}
+        self.validator = FoxInsightsDeviceValidator()
+        self._token_issued_at: float | None = None
+        self.request_statistics: deque[FoxInsightsRequestStatistics] = deque(
+            maxlen=REQUEST_STATISTICS_SIZE
+        )
+
+    @property
+    def email(self) -> str:
+        """Return the email of the account."""
+        return self._email
+
+    @property
+    def token_age(self) -> float | None:
+        """Return the number of seconds since the last access token was issued.
+
+        :return: The age of the access token or None if no token was issued yet.
+        """
+        if self._token_issued_at is None:
+            return None
+
+        return time.monotonic() - self._token_issued_at
 
     async def async_get_data(self) -> dict[str, FoxInsightsDevice]:
         """Return data from the FoxInsights API asynchronously.
@@ -78,27 +138,68 @@ class FoxInsightsApi:
             return {}
 
         try:
-            json_data = await self._request(
+            return await self._request(
                 self._session,
                 method="get",
                 url=API_URL + "device",
-                headers={
-                    "Authorization": "Bearer " + access_token,
-                    "Accept": "application/json; charset=UTF-8",
-                },
+                headers=self._get_headers(access_token),
+                parser=self._parse_devices,
             )
-
-            devices = {}
-            for dev in json_data.get("items"):
-                device = FoxInsightsDevice.init_from_response(dev)
-                devices[device.hwid] = device
-
-            return devices
         except Exception as exception:  # pylint: disable=broad-except
-            LOGGER.error("Error getting token: %s ", exception, exc_info=True)
+            LOGGER.error("Error getting data: %s ", exception, exc_info=True)
 
             raise exception
 
+    async def async_get_devices(
+        self, hwids: Iterable[str]
+    ) -> dict[str, FoxInsightsDevice]:
+        """Return data for the given devices from the FoxInsights API asynchronously.
+
+        The devices are requested concurrently with a bounded number of requests in flight.
+        Devices which could not be retrieved are missing from the result, their errors are kept in device_errors
+        until the next call.
+
+        :param hwids: The hardware IDs of the devices.
+        :return: a dictionary mapping the hardware IDs of the devices to the corresponding FoxInsightsDevice objects.
+        """
+
+        access_token = await self._get_token()
+        if access_token is None:
+            return {}
+
+        headers = self._get_headers(access_token)
+        semaphore = asyncio.Semaphore(DEVICE_REQUEST_CONCURRENCY)
+
+        async def get_device(hwid: str) -> FoxInsightsDevice | None:
+            async with semaphore:
+                return await self._request(
+                    self._session,
+                    method="get",
+                    url=API_URL + "device/" + hwid,
+                    headers=headers,
+                    parser=self._parse_device,
+                )
+
+        hwids = list(hwids)
+        results = await asyncio.gather(
+            *(get_device(hwid) for hwid in hwids), return_exceptions=True
+        )
+
+        devices = {}
+        self.device_errors = {}
+        for hwid, result in zip(hwids, results):
+            if isinstance(result, BaseException):
+                LOGGER.debug("Error getting device %s: %s", hwid, result)
+                self.device_errors[hwid] = result
+                continue
+
+            if result is None:
+                continue
+
+            devices[result.hwid] = result
+
+        return devices
+
     async def async_test_login(self) -> bool:
         """Test if login is possible.
 
@@ -108,11 +209,57 @@ class FoxInsightsApi:
 
         return token is not None
 
+    def _parse_devices(self, json_data: Any) -> dict[str, FoxInsightsDevice]:
+        """Create devices from the decoded list of devices.
+
+        :param json_data: The decoded response.
+        :return: a dictionary mapping the hardware IDs of the devices to the corresponding FoxInsightsDevice objects.
+        :raises FoxInsightsApiError: If the response contains no list of items.
+        """
+        items = json_data.get("items") if isinstance(json_data, dict) else None
+        if not isinstance(items, list):
+            raise FoxInsightsApiError("Invalid response: list of items missing")
+
+        devices = {}
+        for item in items:
+            device = self._parse_device(item)
+            if device is not None:
+                devices[device.hwid] = device
+
+        return devices
+
+    def _parse_device(self, item: Any) -> FoxInsightsDevice | None:
+        """Validate a device item and create a device from it.
+
+        :param item: The decoded device item.
+        :return: The device or None if the item was quarantined.
+        """
+        values = self.validator.validate(item)
+        if values is None:
+            LOGGER.debug("Quarantined invalid device item: %s", item)
+            return None
+
+        return FoxInsightsDevice(**values)
+
+    @staticmethod
+    def _get_headers(access_token: str) -> dict[str, str]:
+        """Return the headers for authenticated requests.
+
+        :param access_token: The access token.
+        :return: The headers.
+        """
+        return {
+            "Authorization": "Bearer " + access_token,
+            "Accept": "application/json; charset=UTF-8",
+        }
+
     async def _get_token(self) -> str | None:
         """Send a login request to the API and return the access token.
 
         :return: The access token if the login request is successful, otherwise None.
         :raises FoxInsightsApiAuthenticationError: If there is an error getting the token.
+        :raises FoxInsightsApiError: If the request failed for another reason, for example a connection error or an
+            oversized response.
         """
         try:
             json_data = await self._request(
@@ -126,7 +273,13 @@ class FoxInsightsApi:
                 headers={"Content-type": "application/json; charset=UTF-8"},
             )
 
-            return json_data.get("access_token")
+            access_token = json_data.get("access_token")
+            if access_token is not None:
+                self._token_issued_at = time.monotonic()
+
+            return access_token
+        except FoxInsightsApiError:
+            raise
         except Exception as exception:  # pylint: disable=broad-except
             LOGGER.exception("Error getting token: %s ", exception)
 
@@ -140,20 +293,28 @@ class FoxInsightsApi:
         data: dict | None = None,
         headers: dict | None = None,
         retry: int = 3,
+        parser: Callable[[Any], Any] | None = None,
     ) -> any:
         """Make HTTP requests and return the JSON response.
 
+        Responses larger than the decode threshold are decoded and parsed in the executor to keep the event loop responsive.
+        Responses which are not JSON or larger than the maximum size are rejected without retry.
+
         :param session: The aiohttp.ClientSession instance used to make the request.
         :param method: The HTTP method to use for the request.
         :param url: The URL to send the request to.
         :param data: The payload for the request (optional).
         :param headers: The headers to include in the request (optional).
         :param retry: The number of times to retry the request if it fails (default is 3).
-        :return: The JSON response from the server.
+        :param parser: A function which converts the JSON response (optional).
+        :return: The JSON response from the server or the result of the parser.
         """
 
         LOGGER.debug("Request %s, retry=%s", url, retry)
 
+        started_at = time.monotonic()
+        response: aiohttp.ClientResponse | None = None
+
         try:
             async with async_timeout.timeout(REQUEST_TIMEOUT):
                 response = await session.request(
@@ -162,30 +323,208 @@ class FoxInsightsApi:
                     headers=headers,
                     json=data,
                 )
-                if response.status in (401, 403):
-                    raise FoxInsightsApiAuthenticationError(
-                        "Invalid credentials",
-                    )
-                response.raise_for_status()
-                return await response.json()
+                try:
+                    if response.status in (401, 403):
+                        raise FoxInsightsApiAuthenticationError(
+                            "Invalid credentials",
+                        )
+                    response.raise_for_status()
+                    body = await self._read_body(response)
+                finally:
+                    # closes the connection if the body was rejected before it was read completely
+                    response.release()
+
+            if len(body) > self._decode_threshold:
+                json_data, result = await asyncio.get_running_loop().run_in_executor(
+                    None, self._decode, body, parser
+                )
+            else:
+                json_data, result = self._decode(body, parser)
+
+            self._record_request(method, url, retry, started_at, "success")
+            if self._recorder is not None:
+                await self._recorder.async_record(
+                    method, url, response.status, json_data, started_at
+                )
+
+            return result
 
         except asyncio.TimeoutError as exception:
+            self._record_request(method, url, retry, started_at, "timeout")
+            await self._async_record_failure(method, url, started_at, None, "timeout")
             if retry > 0:
                 return await self._request(
-                    session, method, url, data, headers, retry - 1
+                    session, method, url, data, headers, retry - 1, parser
                 )
 
             raise FoxInsightsApiConnectionError(
                 "Timeout error fetching information",
             ) from exception
         except (aiohttp.ClientError, socket.gaierror) as exception:
+            self._record_request(method, url, retry, started_at, "connection_error")
+            await self._async_record_failure(
+                method, url, started_at, response, "connection_error"
+            )
             if retry > 0:
                 return await self._request(
-                    session, method, url, data, headers, retry - 1
+                    session, method, url, data, headers, retry - 1, parser
                 )
 
             raise FoxInsightsApiConnectionError(
                 "Error fetching information",
             ) from exception
+        except FoxInsightsApiResponseTooLargeError:
+            self.oversized_responses += 1
+            self._record_request(method, url, retry, started_at, "too_large")
+            await self._async_record_failure(
+                method, url, started_at, response, "too_large"
+            )
+            raise
+        except FoxInsightsApiContentTypeError:
+            self._record_request(method, url, retry, started_at, "content_type")
+            await self._async_record_failure(
+                method, url, started_at, response, "content_type"
+            )
+            raise
+        except FoxInsightsApiAuthenticationError:
+            self._record_request(method, url, retry, started_at, "auth")
+            await self._async_record_failure(method, url, started_at, response, "auth")
+            raise
         except Exception as exception:  # pylint: disable=broad-except
+            self._record_request(method, url, retry, started_at, "error")
+            await self._async_record_failure(method, url, started_at, None, "error")
             raise FoxInsightsApiError("An unexpected error occurred") from exception
+
+    async def _async_record_failure(
+        self,
+        method: str,
+        url: str,
+        started_at: float,
+        response: aiohttp.ClientResponse | None,
+        outcome: str,
+    ) -> None:
+        """Record a failed request in the cassette, so that the failure is reproduced on replay.
+
+        The status and the headers which decide how the response is read are recorded if a response was received.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param started_at: The monotonic time when the request was started.
+        :param response: The response or None if no response was received.
+        :param outcome: A short description of the outcome.
+        """
+        if self._recorder is None:
+            return
+
+        status = None
+        headers = None
+        if response is not None:
+            status = response.status
+            headers = {
+                key: response.headers[key]
+                for key in ("Content-Type", "Content-Length")
+                if key in response.headers
+            }
+            if outcome == "too_large" and "Content-Length" not in headers:
+                # the response was streamed, so it is replayed as announcing more than the maximum size
+                headers["Content-Length"] = str(self._max_response_size + 1)
+
+        await self._recorder.async_record(
+            method, url, status, None, started_at, outcome, headers
+        )
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> bytearray:
+        """Read the response body incrementally into a preallocated buffer.
+
+        The buffer is allocated with the announced content length and grows up to the maximum size if there is none.
+
+        :param response: The response.
+        :return: The raw response body.
+        :raises FoxInsightsApiContentTypeError: If the announced content type is not JSON.
+        :raises FoxInsightsApiResponseTooLargeError: If the response is larger than the maximum size.
+        """
+        content_type = response.headers.get("Content-Type")
+        if content_type is not None:
+            mimetype = content_type.split(";", 1)[0].strip().lower()
+            if mimetype != "application/json" and not mimetype.endswith("+json"):
+                raise FoxInsightsApiContentTypeError(
+                    "Unexpected content type " + mimetype
+                )
+
+        try:
+            content_length = int(response.headers["Content-Length"])
+        except (KeyError, ValueError):
+            content_length = None
+
+        if content_length is not None and content_length > self._max_response_size:
+            raise FoxInsightsApiResponseTooLargeError(
+                f"Response of {content_length} bytes exceeds the maximum size of "
+                f"{self._max_response_size} bytes"
+            )
+
+        buffer = bytearray(
+            content_length
+            if content_length is not None
+            else min(RESPONSE_BUFFER_SIZE, self._max_response_size)
+        )
+        size = 0
+        async for chunk in response.content.iter_chunked(RESPONSE_CHUNK_SIZE):
+            end = size + len(chunk)
+            if end > self._max_response_size:
+                raise FoxInsightsApiResponseTooLargeError(
+                    f"Response exceeds the maximum size of {self._max_response_size} bytes"
+                )
+
+            if end > len(buffer):
+                buffer.extend(
+                    bytes(
+                        min(max(end, 2 * len(buffer)), self._max_response_size)
+                        - len(buffer)
+                    )
+                )
+
+            buffer[size:end] = chunk
+            size = end
+
+        del buffer[size:]
+
+        return buffer
+
+    @staticmethod
+    def _decode(
+        body: bytes | bytearray, parser: Callable[[Any], Any] | None
+    ) -> tuple[Any, Any]:
+        """Decode a JSON response and apply the parser.
+
+        :param body: The raw response body.
+        :param parser: A function which converts the JSON response (optional).
+        :return: The decoded JSON response and the result of the parser.
+        """
+        json_data = json.loads(body)
+        if parser is None:
+            return json_data, json_data
+
+        return json_data, parser(json_data)
+
+    def _record_request(
+        self, method: str, url: str, retry: int, started_at: float, outcome: str
+    ) -> None:
+        """Remember the timing and the outcome of a request.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param retry: The number of remaining retries.
+        :param started_at: The monotonic time when the request was started.
+        :param outcome: A short description of the outcome.
+        """
+        duration = time.monotonic() - started_at
+        self.request_statistics.append(
+            FoxInsightsRequestStatistics(
+                method=method,
+                url=url,
+                started_at=time.time() - duration,
+                duration=duration,
+                retry=retry,
+                outcome=outcome,
+            )
+        )
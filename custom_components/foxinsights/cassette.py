@@ -0,0 +1,249 @@
+"""Recording and replaying of FoxInsights API traffic."""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Any
+
+import aiohttp
+from yarl import URL
+
+from .const import API_URL, CASSETTE_MAX_SIZE, LOGGER
+
+REDACTED = "**REDACTED**"
+REDACTED_KEYS = {"email", "password", "access_token", "refresh_token"}
+
+
+def _sanitize(data: Any) -> Any:
+    """Replace credentials and tokens in the given data.
+
+    :param data: The decoded JSON data.
+    :return: A copy of the data without credentials and tokens.
+    """
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if key in REDACTED_KEYS else _sanitize(value)
+            for key, value in data.items()
+        }
+
+    if isinstance(data, list):
+        return [_sanitize(value) for value in data]
+
+    return data
+
+
+class FoxInsightsCassetteRecorder:
+    """Recorder which appends sanitized requests and responses to a cassette file.
+
+    Every line of the cassette is a compact JSON object with the offset since the start of the recording, the duration,
+    the method, the URL relative to the API URL, the status and the decoded response. Failed requests additionally
+    contain the outcome and the headers of the response, if one was received.
+
+    Once the cassette reaches the maximum size, it is moved to a backup file with the suffix ".1", replacing an
+    older backup, and a new cassette is started whose offsets start at its first request.
+    """
+
+    def __init__(self, path: str, max_size: int = CASSETTE_MAX_SIZE) -> None:
+        """Initialize the object.
+
+        :param path: The path of the cassette file.
+        :param max_size: The size in bytes at which the cassette is rotated.
+        """
+        self.path = path
+        self.max_size = max_size
+        self._size = 0
+        self._started_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def async_record(
+        self,
+        method: str,
+        url: str,
+        status: int | None,
+        body: Any,
+        started_at: float,
+        error: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Append a request and its response to the cassette.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param status: The HTTP status of the response or None if no response was received.
+        :param body: The decoded response.
+        :param started_at: The monotonic time when the request was started.
+        :param error: The outcome of a failed request, for example "timeout" (optional).
+        :param headers: The relevant headers of the response of a failed request (optional).
+        """
+        duration = round(time.monotonic() - started_at, 3)
+
+        async with self._lock:
+            rotate = self._size >= self.max_size
+            if rotate:
+                self._started_at = started_at
+
+            entry = {
+                "t": round(started_at - self._started_at, 3),
+                "d": duration,
+                "m": method,
+                "u": url.removeprefix(API_URL),
+                "s": status,
+                "b": _sanitize(body),
+            }
+            if error is not None:
+                entry["e"] = error
+            if headers:
+                entry["h"] = headers
+
+            line = json.dumps(entry, separators=(",", ":"))
+
+            try:
+                self._size = await asyncio.get_running_loop().run_in_executor(
+                    None, self._write, line, rotate
+                )
+            except OSError as exception:
+                LOGGER.warning("Error writing cassette %s: %s", self.path, exception)
+
+    def _write(self, line: str, rotate: bool) -> int:
+        """Append a line to the cassette file.
+
+        :param line: The line to append.
+        :param rotate: True to move the cassette to the backup file first.
+        :return: The size of the cassette file.
+        """
+        if rotate:
+            os.replace(self.path, self.path + ".1")
+
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+            return file.tell()
+
+
+class FoxInsightsReplayStream:
+    """Stream which returns a recorded body in chunks."""
+
+    def __init__(self, data: bytes) -> None:
+        """Initialize the object."""
+        self._data = data
+
+    async def iter_chunked(self, size: int) -> AsyncIterator[bytes]:
+        """Yield the recorded body in chunks of the given size."""
+        for offset in range(0, len(self._data), size):
+            yield self._data[offset : offset + size]
+
+
+class FoxInsightsReplayResponse:
+    """Response which returns a recorded status and body."""
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        body: Any,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Initialize the object.
+
+        :param headers: Recorded headers which replace the headers derived from the body (optional).
+        """
+        self.method = method
+        self.url = url
+        self.status = status
+
+        data = json.dumps(body).encode("utf-8")
+        self.headers = {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(data)),
+        }
+        self.headers.update(headers or {})
+        self.content = FoxInsightsReplayStream(data)
+
+    def release(self) -> None:
+        """Release the response, there is no connection to release."""
+
+    def raise_for_status(self) -> None:
+        """Raise an error if the recorded status indicates an error."""
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                request_info=aiohttp.RequestInfo(
+                    URL(self.url), self.method, {}, URL(self.url)
+                ),
+                history=(),
+                status=self.status,
+            )
+
+
+class FoxInsightsReplaySession:
+    """Replacement for the HTTP client session which replays a cassette.
+
+    Recorded responses are returned in the order of the recording for each method and URL. Recorded timeouts and
+    connection errors are raised again.
+    """
+
+    def __init__(self, lines: list[str], realtime: bool = False) -> None:
+        """Initialize the object.
+
+        :param lines: The lines of a cassette file.
+        :param realtime: True to respond at the recorded offset plus the recorded duration since the first request,
+            False to respond immediately.
+        """
+        self.realtime = realtime
+        self._started_at: float | None = None
+        self._responses: dict[tuple[str, str], deque[dict[str, Any]]] = {}
+
+        for line in lines:
+            if line.strip() == "":
+                continue
+
+            entry = json.loads(line)
+            self._responses.setdefault((entry["m"], entry["u"]), deque()).append(entry)
+
+    @classmethod
+    def from_file(cls, path: str, realtime: bool = False) -> FoxInsightsReplaySession:
+        """Create object from a cassette file.
+
+        Reads the file synchronously and must not be called from the event loop.
+        """
+        with open(path, encoding="utf-8") as file:
+            return cls(file.readlines(), realtime)
+
+    async def request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> FoxInsightsReplayResponse:
+        """Return the next recorded response for the method and URL.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :return: The recorded response.
+        :raises aiohttp.ClientConnectionError: If there is no recorded response left or a connection error was recorded.
+        :raises asyncio.TimeoutError: If a timeout was recorded.
+        """
+        responses = self._responses.get((method, url.removeprefix(API_URL)))
+        if not responses:
+            raise aiohttp.ClientConnectionError("No recorded response for " + url)
+
+        entry = responses.popleft()
+        if self.realtime:
+            if self._started_at is None:
+                self._started_at = time.monotonic() - entry["t"]
+
+            delay = self._started_at + entry["t"] + entry["d"] - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        error = entry.get("e")
+        if error == "timeout":
+            raise asyncio.TimeoutError
+        if error == "connection_error" and entry["s"] is None:
+            raise aiohttp.ClientConnectionError("Recorded connection error for " + url)
+        if error == "error":
+            raise ValueError("Recorded error for " + url)
+
+        return FoxInsightsReplayResponse(
+            method, url, entry["s"], entry["b"], entry.get("h")
+        )
@@ -5,17 +5,44 @@ from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .api import (
-    FoxInsightsApi,
-    FoxInsightsApiAuthenticationError,
-    FoxInsightsApiConnectionError,
-    FoxInsightsApiError,
+from . import _get_accounts, async_import_modules
+from .const import (
+    ALERT_BATTERY_LEVELS,
+    CONF_ACCOUNT_SENSORS,
+    CONF_ACCOUNTS,
+    CONF_ADD_ANOTHER,
+    CONF_ALERT_BATTERY_LEVEL,
+    CONF_ALERT_DAYS_REACH,
+    CONF_ALERT_FILL_LEVEL_PERCENT,
+    CONF_ALERT_VALIDATION_ERROR,
+    CONF_CONSUMPTION_ROLLUPS,
+    CONF_DEADBAND_FILL_LEVEL_PERCENT,
+    CONF_DEADBAND_FILL_LEVEL_QUANTITY,
+    CONF_DEBUG_HWIDS,
+    CONF_DEVICE_FUEL_TYPES,
+    CONF_DEVICE_SENSOR_KINDS,
+    CONF_EMAIL,
+    CONF_ESTIMATED_FILL_LEVEL,
+    CONF_FUEL_TYPE,
+    CONF_PASSWORD,
+    CONF_RECORD_TRAFFIC,
+    CONF_SENSOR_KINDS,
+    CONF_SHOW_CONSUMPTION_ATTRIBUTES,
+    DEFAULT_DEADBAND_FILL_LEVEL_PERCENT,
+    DEFAULT_DEADBAND_FILL_LEVEL_QUANTITY,
+    DOMAIN,
+    FUEL_TYPE_AUTO,
+    FUEL_TYPES,
+    LEGACY_SENSOR_KINDS,
+    LOGGER,
+    NAME,
+    SENSOR_KINDS,
 )
-from .const import CONF_EMAIL, CONF_PASSWORD, DOMAIN, LOGGER, NAME
 
 
 class FoxInsightsConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -23,59 +50,326 @@ class FoxInsightsConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> FoxInsightsOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return FoxInsightsOptionsFlowHandler(config_entry)
+
+    def __init__(self) -> None:
+        """Initialize the object."""
+        self._accounts: list[dict[str, str]] = []
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle a flow initialized by the user."""
+        return await self._async_step_account("user", user_input)
+
+    async def async_step_account(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle an additional account."""
+        return await self._async_step_account("account", user_input)
+
+    async def _async_step_account(
+        self, step_id: str, user_input: dict[str, Any] | None
+    ) -> FlowResult:
+        """Validate the credentials of an account and ask for another account if requested.
+
+        An additional account may be left empty to create the entry with the accounts entered so far.
+
+        :param step_id: The ID of the current step.
+        :param user_input: The submitted form (optional).
+        """
         errors = {}
 
         if user_input is not None:
-            api = FoxInsightsApi(
-                user_input[CONF_EMAIL],
-                user_input[CONF_PASSWORD],
-                async_get_clientsession(self.hass),
-            )
-
-            try:
-                await api.async_test_login()
-            except FoxInsightsApiAuthenticationError as exception:
-                LOGGER.error(exception)
+            if self._accounts and not user_input.get(CONF_EMAIL):
+                return await self._async_create_entry()
+
+            if user_input.get(CONF_EMAIL, "").lower() in self._configured_emails():
+                errors["base"] = "account_configured"
+            elif any(
+                account[CONF_EMAIL].lower() == user_input[CONF_EMAIL].lower()
+                for account in self._accounts
+            ):
+                errors["base"] = "duplicate_account"
+            elif not user_input.get(CONF_PASSWORD):
                 errors["base"] = "auth"
-            except FoxInsightsApiConnectionError as exception:
-                LOGGER.warning(exception)
-                errors["base"] = "connection"
-            except FoxInsightsApiError as exception:
-                LOGGER.exception(exception)
-                errors["base"] = "unknown"
             else:
-                await self.async_set_unique_id(
-                    NAME + "-" + user_input[CONF_EMAIL.lower()]
-                )
-                self._abort_if_unique_id_configured()
+                errors = await self._async_validate_login(user_input)
 
-                return self.async_create_entry(
-                    title=user_input[CONF_EMAIL],
-                    data=user_input,
+            if not errors:
+                self._accounts.append(
+                    {
+                        CONF_EMAIL: user_input[CONF_EMAIL],
+                        CONF_PASSWORD: user_input[CONF_PASSWORD],
+                    }
                 )
 
+                if user_input.get(CONF_ADD_ANOTHER, False):
+                    return await self.async_step_account()
+
+                return await self._async_create_entry()
+
         return self.async_show_form(
-            step_id="user",
+            step_id=step_id,
             data_schema=vol.Schema(
                 {
+                    # additional accounts are optional, so that the entry can be created with the accounts so far
                     vol.Required(
                         CONF_EMAIL,
                         default=(user_input or {}).get(CONF_EMAIL),
+                    )
+                    if not self._accounts
+                    else vol.Optional(
+                        CONF_EMAIL,
+                        description={
+                            "suggested_value": (user_input or {}).get(CONF_EMAIL)
+                        },
                     ): selector.TextSelector(
                         selector.TextSelectorConfig(
                             type=selector.TextSelectorType.TEXT
                         ),
                     ),
-                    vol.Required(CONF_PASSWORD): selector.TextSelector(
+                    vol.Required(CONF_PASSWORD)
+                    if not self._accounts
+                    else vol.Optional(CONF_PASSWORD): selector.TextSelector(
                         selector.TextSelectorConfig(
                             type=selector.TextSelectorType.PASSWORD
                         ),
                     ),
+                    vol.Optional(
+                        CONF_ADD_ANOTHER, default=False
+                    ): selector.BooleanSelector(),
                 }
             ),
             errors=errors,
         )
+
+    def _configured_emails(self) -> set[str]:
+        """Return the emails of the accounts of all existing config entries in lower case."""
+        return {
+            account[CONF_EMAIL].lower()
+            for entry in self._async_current_entries(include_ignore=False)
+            for account in _get_accounts(entry)
+        }
+
+    async def _async_validate_login(self, user_input: dict[str, Any]) -> dict[str, str]:
+        """Test the credentials of an account.
+
+        :param user_input: The submitted form.
+        :return: The errors to show in the form.
+        """
+        # imported here because the HTTP client is not needed to show the forms
+        await async_import_modules(self.hass, [".api"])
+
+        from .api import (
+            FoxInsightsApi,
+            FoxInsightsApiAuthenticationError,
+            FoxInsightsApiConnectionError,
+            FoxInsightsApiError,
+        )
+
+        api = FoxInsightsApi(
+            user_input[CONF_EMAIL],
+            user_input[CONF_PASSWORD],
+            async_get_clientsession(self.hass),
+        )
+
+        try:
+            await api.async_test_login()
+        except FoxInsightsApiAuthenticationError as exception:
+            LOGGER.error(exception)
+            return {"base": "auth"}
+        except FoxInsightsApiConnectionError as exception:
+            LOGGER.warning(exception)
+            return {"base": "connection"}
+        except FoxInsightsApiError as exception:
+            LOGGER.exception(exception)
+            return {"base": "unknown"}
+
+        return {}
+
+    async def _async_create_entry(self) -> FlowResult:
+        """Create an entry with all entered accounts.
+
+        Aborts if one of the accounts was added to another entry while this flow was in progress.
+        """
+        email = self._accounts[0][CONF_EMAIL]
+
+        await self.async_set_unique_id(NAME + "-" + email)
+        self._abort_if_unique_id_configured()
+
+        configured_emails = self._configured_emails()
+        if any(
+            account[CONF_EMAIL].lower() in configured_emails
+            for account in self._accounts
+        ):
+            return self.async_abort(reason="already_configured")
+
+        title = email
+        if len(self._accounts) > 1:
+            title += " (+" + str(len(self._accounts) - 1) + ")"
+
+        return self.async_create_entry(
+            title=title,
+            data={CONF_ACCOUNTS: self._accounts},
+        )
+
+
+class FoxInsightsOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for FoxInsights."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the object."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_DEADBAND_FILL_LEVEL_PERCENT,
+                        default=options.get(
+                            CONF_DEADBAND_FILL_LEVEL_PERCENT,
+                            DEFAULT_DEADBAND_FILL_LEVEL_PERCENT,
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=100,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_DEADBAND_FILL_LEVEL_QUANTITY,
+                        default=options.get(
+                            CONF_DEADBAND_FILL_LEVEL_QUANTITY,
+                            DEFAULT_DEADBAND_FILL_LEVEL_QUANTITY,
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_SHOW_CONSUMPTION_ATTRIBUTES,
+                        default=options.get(CONF_SHOW_CONSUMPTION_ATTRIBUTES, False),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_ACCOUNT_SENSORS,
+                        default=options.get(CONF_ACCOUNT_SENSORS, False),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_ESTIMATED_FILL_LEVEL,
+                        default=options.get(CONF_ESTIMATED_FILL_LEVEL, False),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_CONSUMPTION_ROLLUPS,
+                        default=options.get(CONF_CONSUMPTION_ROLLUPS, False),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_SENSOR_KINDS,
+                        default=[
+                            LEGACY_SENSOR_KINDS.get(kind, kind)
+                            for kind in options.get(CONF_SENSOR_KINDS, SENSOR_KINDS)
+                        ],
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=SENSOR_KINDS,
+                            multiple=True,
+                            translation_key=CONF_SENSOR_KINDS,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_DEVICE_SENSOR_KINDS,
+                        default=options.get(CONF_DEVICE_SENSOR_KINDS, ""),
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_FUEL_TYPE,
+                        default=options.get(CONF_FUEL_TYPE, FUEL_TYPE_AUTO),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=FUEL_TYPES,
+                            translation_key=CONF_FUEL_TYPE,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_DEVICE_FUEL_TYPES,
+                        default=options.get(CONF_DEVICE_FUEL_TYPES, ""),
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_ALERT_FILL_LEVEL_PERCENT,
+                        default=options.get(CONF_ALERT_FILL_LEVEL_PERCENT, 0),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=100,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_ALERT_DAYS_REACH,
+                        default=options.get(CONF_ALERT_DAYS_REACH, 0),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_ALERT_BATTERY_LEVEL,
+                        default=str(
+                            options.get(CONF_ALERT_BATTERY_LEVEL, "off")
+                        ).lower(),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=ALERT_BATTERY_LEVELS,
+                            translation_key=CONF_ALERT_BATTERY_LEVEL,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_ALERT_VALIDATION_ERROR,
+                        default=options.get(CONF_ALERT_VALIDATION_ERROR, False),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_DEBUG_HWIDS,
+                        default=options.get(CONF_DEBUG_HWIDS, ""),
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_RECORD_TRAFFIC,
+                        default=options.get(CONF_RECORD_TRAFFIC, False),
+                    ): selector.BooleanSelector(),
+                }
+            ),
+        )
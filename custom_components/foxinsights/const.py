@@ -9,5 +9,115 @@ API_URL = "https://api.oilfox.io/customer-api/v1/"
 
 CONF_EMAIL = "email"
 CONF_PASSWORD = "password"
+CONF_ACCOUNTS = "accounts"
+CONF_ADD_ANOTHER = "add_another"
+CONF_DEADBAND_FILL_LEVEL_PERCENT = "deadband_fill_level_percent"
+CONF_DEADBAND_FILL_LEVEL_QUANTITY = "deadband_fill_level_quantity"
+CONF_SHOW_CONSUMPTION_ATTRIBUTES = "show_consumption_attributes"
+CONF_DEBUG_HWIDS = "debug_hwids"
+CONF_ACCOUNT_SENSORS = "account_sensors"
+CONF_RECORD_TRAFFIC = "record_traffic"
+CONF_ESTIMATED_FILL_LEVEL = "estimated_fill_level"
+CONF_SENSOR_KINDS = "sensor_kinds"
+CONF_CONSUMPTION_ROLLUPS = "consumption_rollups"
+CONF_DEVICE_SENSOR_KINDS = "device_sensor_kinds"
+CONF_ALERT_FILL_LEVEL_PERCENT = "alert_fill_level_percent"
+CONF_ALERT_DAYS_REACH = "alert_days_reach"
+CONF_ALERT_BATTERY_LEVEL = "alert_battery_level"
+CONF_ALERT_VALIDATION_ERROR = "alert_validation_error"
+CONF_FUEL_TYPE = "fuel_type"
+CONF_DEVICE_FUEL_TYPES = "device_fuel_types"
+
+SENSOR_KINDS = [
+    "fill_level_quantity",
+    "fill_level_percent",
+    "battery_level",
+    "last_measurement",
+    "next_measurement",
+    "material_consumption",
+    "energy_consumption",
+    "days_reach",
+    "validation_error",
+]
+
+# sensor kinds saved in the options by previous versions -> sensor kind
+LEGACY_SENSOR_KINDS = {
+    "fillLevelQuantity": "fill_level_quantity",
+    "fillLevelPercent": "fill_level_percent",
+    "batteryLevel": "battery_level",
+    "lastMeasurement": "last_measurement",
+    "nextMeasurement": "next_measurement",
+    "materialConsumption": "material_consumption",
+    "energyConsumption": "energy_consumption",
+    "daysReach": "days_reach",
+    "validationError": "validation_error",
+}
+
+DEFAULT_DEADBAND_FILL_LEVEL_PERCENT = 0
+DEFAULT_DEADBAND_FILL_LEVEL_QUANTITY = 0
+
+EVENT_REFILL = "foxinsights_refill"
+EVENT_LEAK_SUSPECTED = "foxinsights_leak_suspected"
+EVENT_SENSOR_JUMP = "foxinsights_sensor_jump"
+EVENT_ALERT = "foxinsights_alert"
+
+BATTERY_LEVELS = ["FULL", "GOOD", "MEDIUM", "WARNING", "CRITICAL"]
+ALERT_BATTERY_LEVELS = ["off", "medium", "warning", "critical"]
+ALERT_STORAGE_VERSION = 1
+ALERT_SAVE_DELAY = 10
+
+FUEL_TYPE_AUTO = "auto"
+FUEL_TYPES = [
+    FUEL_TYPE_AUTO,
+    "heating_oil_el",
+    "heating_oil_el_b10",
+    "heating_oil_el_b20",
+    "biodiesel",
+    "pellets",
+    "lpg",
+]
+
+EWMA_ALPHA = 0.2
+ANOMALY_THRESHOLD = 4
+ANOMALY_MIN_SAMPLES = 5
+LEAK_MAX_CONSECUTIVE = 3
+REFILL_MIN_PERCENT = 5
+REFILL_MIN_QUANTITY = 100
+
+ESTIMATE_INTERVAL = 300
+
+HEATING_SEASON_START_MONTH = 10
+ROLLUP_LOOKBACK_DAYS = 31
+
+ARCHIVE_RETENTION = 3650 * 86400
+ARCHIVE_COMPACT_INTERVAL = 86400
+WS_TYPE_HISTORY = "foxinsights/history"
+HISTORY_MAX_POINTS = 10000
+
+SERVICE_REFRESH = "refresh"
+ATTR_HWIDS = "hwids"
+REFRESH_COOLDOWN = 60
+SERVICE_PROFILE = "profile"
+ATTR_REFRESHES = "refreshes"
+PROFILE_TOP_FUNCTIONS = 20
+
+POLL_INTERVAL = 900
+SCHEDULER_TICK = 30
+MAX_CONCURRENT_POLLS = 2
+PULL_FORWARD_COOLDOWN = 300
+
+FULL_SYNC_INTERVAL = 3600
+DEVICE_REQUEST_CONCURRENCY = 4
+MAX_DEVICE_REQUESTS = 20
+OVERDUE_RETRY_INTERVAL = 3600
+ACCOUNT_REQUEST_CONCURRENCY = 4
 
 REQUEST_TIMEOUT = 10
+DECODE_EXECUTOR_THRESHOLD = 65536
+MAX_RESPONSE_SIZE = 16 * 1024 * 1024
+RESPONSE_BUFFER_SIZE = 65536
+RESPONSE_CHUNK_SIZE = 65536
+REQUEST_STATISTICS_SIZE = 50
+CASSETTE_MAX_SIZE = 10 * 1024 * 1024
+QUARANTINE_SIZE = 10
+WARNING_INTERVAL = 3600
@@ -1,18 +1,76 @@
 """DataUpdateCoordinator for FoxInsights."""
 
-from datetime import timedelta
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
+from .aggregate import FoxInsightsFleetAggregate
+from .alerts import (
+    FoxInsightsAlertEvaluator,
+    FoxInsightsAlertThresholds,
+    get_alert_store,
+)
 from .api import (
     FoxInsightsApi,
     FoxInsightsApiAuthenticationError,
     FoxInsightsApiConnectionError,
     FoxInsightsApiError,
+    FoxInsightsApiResponseTooLargeError,
     FoxInsightsDevice,
 )
-from .const import DOMAIN, LOGGER
+from .const import (
+    ACCOUNT_REQUEST_CONCURRENCY,
+    ALERT_SAVE_DELAY,
+    ARCHIVE_COMPACT_INTERVAL,
+    ARCHIVE_RETENTION,
+    CONF_DEBUG_HWIDS,
+    DOMAIN,
+    ESTIMATE_INTERVAL,
+    EVENT_ALERT,
+    FULL_SYNC_INTERVAL,
+    LOGGER,
+    MAX_DEVICE_REQUESTS,
+    OVERDUE_RETRY_INTERVAL,
+    REFRESH_COOLDOWN,
+    ROLLUP_LOOKBACK_DAYS,
+    WARNING_INTERVAL,
+)
+from .detector import FoxInsightsAnomalyDetector
+from .devices import FoxInsightsDeviceRegistrar
+from .fuel import FoxInsightsFuelTable
+from .history import FoxInsightsHistoryArchive
+from .rollup import PERIODS, FoxInsightsConsumptionRollups, period_start
+from .schema import parse_timestamp
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.storage import Store
+
+    from .scheduler import FoxInsightsPollScheduler
+
+
+@dataclass
+class FoxInsightsUpdateSummary:
+    """Summary of a single update of all devices."""
+
+    devices: int = 0
+    fetched: int = 0
+    full_sync: bool = False
+    changed: int = 0
+    unchanged: int = 0
+    validation_errors: int = 0
+    failed_accounts: int = 0
+    failed: bool = False
+    duration: float = 0.0
 
 
 class FoxInsightsDataUpdateCoordinator(
@@ -20,16 +78,72 @@ class FoxInsightsDataUpdateCoordinator(
 ):
     """The coordinator responsible for updating and managing the data for FoxInsights devices."""
 
-    def __init__(self, hass: HomeAssistant, api: FoxInsightsApi) -> None:
-        """Initialize the object."""
-        self.api = api
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        apis: list[FoxInsightsApi],
+        archive: FoxInsightsHistoryArchive,
+    ) -> None:
+        """Initialize the object.
+
+        :param hass: The Home Assistant instance.
+        :param apis: The API clients of all accounts of the config entry.
+        :param archive: The history archive of the config entry.
+        """
+        self.apis = apis
+        self.archive = archive
         self.update_datetime: dict[str, str] = {}
         self.update_flag: dict[str, bool] = {}
         self.unavailable: bool = False
+        self.state_writes_emitted: int = 0
+        self.state_writes_suppressed: int = 0
+        self.device_versions: dict[str, int] = {}
+        self.device_updates_changed: int = 0
+        self.device_updates_unchanged: int = 0
+        self.last_update_summary: FoxInsightsUpdateSummary | None = None
+        self.aggregate = FoxInsightsFleetAggregate()
+        self.detector = FoxInsightsAnomalyDetector()
+        self.rollups = FoxInsightsConsumptionRollups()
+        self._rollups_loaded: bool = False
+        self._alerts_loaded: bool = False
+        self._compacted_at: float | None = None
+        self._warning_times: dict[str, float] = {}
+        self._demand_refresh_task: asyncio.Task | None = None
+        self._demand_refreshed_at: float | None = None
+        self._demand_refresh_running: bool = False
+        self._forced_hwids: set[str] = set()
+        self._force_full_sync: bool = False
+        self._full_synced_at: float | None = None
+        self._next_metering: dict[str, datetime | None] = {}
+        self.scheduler: FoxInsightsPollScheduler | None = None
+        self._estimate_listeners: dict[CALLBACK_TYPE, None] = {}
+        self._unsub_estimate: CALLBACK_TYPE | None = None
 
-        super().__init__(
-            hass, LOGGER, name=DOMAIN, update_interval=timedelta(minutes=15)
-        )
+        self._polled_at: datetime | None = None
+
+        # polls are scheduled by the domain-wide FoxInsightsPollScheduler
+        super().__init__(hass, LOGGER, name=DOMAIN, update_interval=None)
+
+        self.debug_hwids: set[str] = set()
+        self.alerts = FoxInsightsAlertEvaluator(FoxInsightsAlertThresholds())
+        self._alert_store: Store[dict[str, list[str]]] | None = None
+        self.devices = FoxInsightsDeviceRegistrar(hass, self.config_entry)
+        self.fuels = FoxInsightsFuelTable()
+        if self.config_entry is not None:
+            self.fuels = FoxInsightsFuelTable.init_from_options(
+                self.config_entry.options
+            )
+            self.alerts = FoxInsightsAlertEvaluator(
+                FoxInsightsAlertThresholds.init_from_options(self.config_entry.options)
+            )
+            self._alert_store = get_alert_store(hass, self.config_entry.entry_id)
+            self.debug_hwids = {
+                hwid.strip()
+                for hwid in self.config_entry.options.get(CONF_DEBUG_HWIDS, "").split(
+                    ","
+                )
+                if hwid.strip() != ""
+            }
 
     async def _async_update_data(self) -> dict[str, FoxInsightsDevice]:
         """Update the data for all devices. Does not raise exceptions because otherwise all sensor states are set to "unavailable".
@@ -37,55 +151,535 @@ class FoxInsightsDataUpdateCoordinator(
         :return: a dictionary mapping the hardware IDs of the devices to the corresponding FoxInsightsDevice objects.
         """
         self.unavailable = False
+        started_at = time.monotonic()
+        summary = FoxInsightsUpdateSummary()
+        meterings: list[tuple[str, int, int, int | None]] = []
+        changed: list[FoxInsightsDevice] = []
 
         try:
-            devices = await self.api.async_get_data()
+            if not self._rollups_loaded:
+                await self._async_load_rollups()
+
+            if not self._alerts_loaded:
+                await self._async_load_alerts()
+
+            devices = await self._async_fetch_devices(summary)
             for device in devices.values():
                 last_update = self.update_datetime.get(device.hwid, None)
-                if last_update is None:
-                    self.update_flag[device.hwid] = True
+                update_required = (
+                    last_update is None or last_update != device.currentMeteringAt
+                )
+                self.update_flag[device.hwid] = update_required
+                self.update_datetime[device.hwid] = device.currentMeteringAt
+
+                if self.is_debug_enabled(device):
                     LOGGER.debug(
-                        "Update required for HWID %s: previous value = None, current value = %s",
+                        "%s for HWID %s: previous value = %s, current value = %s",
+                        "Update required" if update_required else "No update required",
                         device.hwid,
+                        last_update,
                         device.currentMeteringAt,
                     )
+
+                summary.devices += 1
+                if update_required:
+                    self.device_versions[device.hwid] = (
+                        self.device_versions.get(device.hwid, 0) + 1
+                    )
+                    self._next_metering[device.hwid] = parse_timestamp(
+                        device.nextMeteringAt
+                    )
+                    self.aggregate.update(device)
+                    for event_type, event_data in self.detector.update(device):
+                        self.hass.bus.async_fire(event_type, event_data)
+                    metering = self._get_metering(device)
+                    if metering is not None:
+                        meterings.append(metering)
+                        self.rollups.update(*metering[:3])
+                    changed.append(device)
+                    summary.changed += 1
                 else:
-                    if last_update != device.currentMeteringAt:
-                        self.update_flag[device.hwid] = True
-                        LOGGER.debug(
-                            "Update required for HWID %s: previous value = %s, current value = %s",
-                            device.hwid,
-                            last_update,
-                            device.currentMeteringAt,
-                        )
-                    else:
-                        self.update_flag[device.hwid] = False
-                        LOGGER.debug(
-                            "No update required for HWID %s: previous value = %s, current value = %s",
-                            device.hwid,
-                            last_update,
-                            device.currentMeteringAt,
-                        )
+                    summary.unchanged += 1
+                    self._back_off_overdue(device.hwid)
 
-                self.update_datetime[device.hwid] = device.currentMeteringAt
+                if device.validationError not in (None, "NO_ERROR"):
+                    summary.validation_errors += 1
+
+            if len(self.aggregate) != len(devices):
+                for hwid in self.aggregate.hwids - devices.keys():
+                    self.aggregate.remove(hwid)
+                    self._next_metering.pop(hwid, None)
+                    self.detector.remove(hwid)
+                    self.rollups.remove(hwid)
+                    self.alerts.remove(hwid)
+
+            self._fire_alerts(changed)
 
+            await self._async_archive(meterings)
+            self._finish_update(summary, started_at)
             return devices
         except FoxInsightsApiAuthenticationError as exception:
             LOGGER.error(exception)
             # raise ConfigEntryAuthFailed(exception) from exception
         except FoxInsightsApiConnectionError as exception:
-            LOGGER.warning(exception)
+            self._warning("connection", exception)
+            # raise UpdateFailed(exception) from exception
+        except FoxInsightsApiResponseTooLargeError as exception:
+            self._warning("response_size", exception)
             # raise UpdateFailed(exception) from exception
         except FoxInsightsApiError as exception:
-            LOGGER.warning(exception)
+            self._warning("api", exception)
             # raise UpdateFailed(exception) from exception
         except Exception as exception:  # pylint: disable=broad-except
             LOGGER.exception(exception)
             # raise UpdateFailed(exception) from exception
 
         self.unavailable = True
+        summary.failed = True
+        self._finish_update(summary, started_at)
         return {}
 
+    def _fire_alerts(self, devices: list[FoxInsightsDevice]) -> None:
+        """Evaluate the alert thresholds for devices with new meterings and fire one event per account with new alerts.
+
+        The active alerts are saved whenever they change.
+
+        :param devices: The devices with new meterings.
+        """
+        entry_id = self.config_entry.entry_id if self.config_entry else None
+        accounts = {device.hwid: device.account for device in devices}
+        account_alerts: dict[str | None, list[dict[str, Any]]] = {}
+        for alert in self.alerts.evaluate(devices):
+            account_alerts.setdefault(accounts.get(alert["hwid"]), []).append(alert)
+
+        for account, alerts in account_alerts.items():
+            self.hass.bus.async_fire(
+                EVENT_ALERT,
+                {"config_entry_id": entry_id, "account": account, "alerts": alerts},
+            )
+
+        if self.alerts.changed and self._alert_store is not None:
+            self._alert_store.async_delay_save(self._get_alert_data, ALERT_SAVE_DELAY)
+
+    def _get_alert_data(self) -> dict[str, list[str]]:
+        """Return the active alerts to be saved and mark them as saved."""
+        self.alerts.changed = False
+
+        return self.alerts.as_dict()
+
+    async def _async_load_alerts(self) -> None:
+        """Restore the active alerts, so that alerts which were reported before a restart are not reported again."""
+        self._alerts_loaded = True
+        if self._alert_store is None:
+            return
+
+        try:
+            data = await self._alert_store.async_load()
+        except HomeAssistantError as exception:
+            self._warning("alerts", exception)
+            return
+
+        if data is not None:
+            self.alerts.restore(data)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call and save pending changes of the active alerts before the entry is unloaded.
+
+        A demanded refresh which is still waiting for its cooldown is cancelled, so that it does not refresh the
+        unloaded coordinator.
+        """
+        await super().async_shutdown()
+
+        if self._demand_refresh_task is not None and not self._demand_refresh_running:
+            self._demand_refresh_task.cancel()
+
+        if self.alerts.changed and self._alert_store is not None:
+            await self._alert_store.async_save(self._get_alert_data())
+
+    async def _async_fetch_devices(
+        self, summary: FoxInsightsUpdateSummary
+    ) -> dict[str, FoxInsightsDevice]:
+        """Fetch the list of all devices or only the devices which are due.
+
+        The full list is fetched periodically, if there is no data yet, if it was demanded or if more than
+        MAX_DEVICE_REQUESTS devices are due. Otherwise only devices whose next metering has passed and devices which
+        were demanded are fetched.
+
+        :param summary: The summary of the current update.
+        :return: a dictionary mapping the hardware IDs of the devices to the corresponding FoxInsightsDevice objects.
+        """
+        forced_hwids = self._forced_hwids
+        force_full_sync = self._force_full_sync
+        self._forced_hwids = set()
+        self._force_full_sync = False
+
+        now = time.monotonic()
+        utcnow = dt_util.utcnow()
+        due_hwids = set()
+        if self.data:
+            due_hwids = forced_hwids & self.data.keys()
+            for hwid, next_metering in self._next_metering.items():
+                if next_metering is not None and next_metering <= utcnow:
+                    due_hwids.add(hwid)
+
+        # one request for the list of all devices is cheaper than many requests for single devices
+        if (
+            force_full_sync
+            or not self.data
+            or self._full_synced_at is None
+            or now - self._full_synced_at >= FULL_SYNC_INTERVAL
+            or len(due_hwids) > MAX_DEVICE_REQUESTS
+        ):
+            results = await self._async_gather_accounts(
+                [api.async_get_data() for api in self.apis]
+            )
+            self._polled_at = utcnow
+            summary.full_sync = True
+            devices = self._merge_results(
+                self.apis, results, summary, keep_missing=False
+            )
+
+            # failed accounts are synced again on the next poll
+            if summary.failed_accounts == 0:
+                self._full_synced_at = now
+
+            return devices
+
+        self._polled_at = utcnow
+        if not due_hwids:
+            return dict(self.data)
+
+        account_hwids: dict[str | None, list[str]] = {}
+        for hwid in due_hwids:
+            if hwid in self.data:
+                account_hwids.setdefault(self.data[hwid].account, []).append(hwid)
+
+        apis = [api for api in self.apis if api.email in account_hwids]
+        results = await self._async_gather_accounts(
+            [api.async_get_devices(account_hwids[api.email]) for api in apis]
+        )
+
+        return self._merge_results(apis, results, summary, keep_missing=True)
+
+    async def _async_gather_accounts(
+        self, requests: list[Awaitable[dict[str, FoxInsightsDevice]]]
+    ) -> list[dict[str, FoxInsightsDevice] | BaseException]:
+        """Run one request per account concurrently with a bounded number of accounts in flight.
+
+        :param requests: The requests in the order of the accounts.
+        :return: The devices or the exception of each account.
+        """
+        semaphore = asyncio.Semaphore(ACCOUNT_REQUEST_CONCURRENCY)
+
+        async def run(
+            request: Awaitable[dict[str, FoxInsightsDevice]],
+        ) -> dict[str, FoxInsightsDevice]:
+            async with semaphore:
+                return await request
+
+        return await asyncio.gather(
+            *(run(request) for request in requests), return_exceptions=True
+        )
+
+    def _merge_results(
+        self,
+        apis: list[FoxInsightsApi],
+        results: list[dict[str, FoxInsightsDevice] | BaseException],
+        summary: FoxInsightsUpdateSummary,
+        keep_missing: bool,
+    ) -> dict[str, FoxInsightsDevice]:
+        """Merge the devices of all accounts into one dictionary.
+
+        The previous devices of an account are kept if its request failed, so that one failing account does not
+        affect the others. If the requests of all accounts failed, the first error is raised.
+
+        :param apis: The API clients of the requested accounts.
+        :param results: The devices or the exception of each account.
+        :param summary: The summary of the current update.
+        :param keep_missing: True to keep previous devices which are missing from the results, False otherwise.
+        :return: a dictionary mapping the hardware IDs of the devices to the corresponding FoxInsightsDevice objects.
+        """
+        previous_devices = self.data or {}
+        devices = dict(previous_devices) if keep_missing else {}
+        errors = []
+
+        for api, result in zip(apis, results):
+            if isinstance(result, BaseException):
+                errors.append(result)
+                self._warning(
+                    "account-" + api.email,
+                    f"Error fetching account {api.email}: {result}",
+                )
+                if not keep_missing:
+                    devices.update(
+                        (hwid, device)
+                        for hwid, device in previous_devices.items()
+                        if device.account == api.email
+                    )
+                continue
+
+            for device in result.values():
+                device.account = api.email
+
+            # the devices are requested one by one only if missing devices are kept
+            if keep_missing and api.device_errors:
+                hwid, error = next(iter(api.device_errors.items()))
+                self._warning(
+                    "devices-" + api.email,
+                    f"Error fetching {len(api.device_errors)} devices of account {api.email}, "
+                    f"first error for {hwid}: {error}",
+                )
+
+            devices.update(result)
+            summary.fetched += len(result)
+
+        summary.failed_accounts = len(errors)
+        if errors and len(errors) == len(apis):
+            raise errors[0]
+
+        return devices
+
+    def _back_off_overdue(self, hwid: str) -> None:
+        """Retry a device whose next metering has passed without a new metering later instead of on every poll.
+
+        :param hwid: The hardware ID of the device which was not updated.
+        """
+        next_metering = self._next_metering.get(hwid)
+        if (
+            next_metering is not None
+            and self._polled_at is not None
+            and next_metering <= self._polled_at
+        ):
+            self._next_metering[hwid] = self._polled_at + timedelta(
+                seconds=OVERDUE_RETRY_INTERVAL
+            )
+
+    def _get_metering(
+        self, device: FoxInsightsDevice
+    ) -> tuple[str, int, int, int | None] | None:
+        """Return the current metering of a device in the format of the history archive.
+
+        :param device: The device with a new metering.
+        :return: The hardware ID, UNIX timestamp, quantity and percentage or None if the metering is incomplete.
+        """
+        metering_at = parse_timestamp(device.currentMeteringAt)
+        if metering_at is None or device.fillLevelQuantity is None:
+            return None
+
+        return (
+            device.hwid,
+            int(metering_at.timestamp()),
+            device.fillLevelQuantity,
+            device.fillLevelPercent,
+        )
+
+    async def _async_load_rollups(self) -> None:
+        """Compute the consumption totals of the current periods and the consumption rates from the history archive.
+
+        Meterings since the start of the earliest current period minus a lookback are read, so that the
+        consumption of the first metering in each period is known. The same meterings seed the anomaly detector,
+        so that estimates are available before the next metering.
+        """
+        self._rollups_loaded = True
+
+        now = dt_util.utcnow()
+        start = min(period_start(period, now) for period in PERIODS)
+        try:
+            history = await self.hass.async_add_executor_job(
+                self.archive.query,
+                None,
+                int((start - timedelta(days=ROLLUP_LOOKBACK_DAYS)).timestamp()),
+            )
+        except (OSError, ValueError) as exception:
+            self._warning("archive", exception)
+            return
+
+        for hwid, columns in history.items():
+            for timestamp, quantity in zip(columns["t"], columns["quantity"]):
+                self.rollups.update(hwid, timestamp, quantity)
+            self.detector.seed(
+                hwid, columns["t"], columns["quantity"], columns["percent"]
+            )
+
+    async def _async_archive(
+        self, meterings: list[tuple[str, int, int, int | None]]
+    ) -> None:
+        """Append new meterings to the history archive and compact it periodically.
+
+        :param meterings: The new meterings.
+        """
+        now = time.monotonic()
+        compact = (
+            self._compacted_at is None
+            or now - self._compacted_at >= ARCHIVE_COMPACT_INTERVAL
+        )
+        if not meterings and not compact:
+            return
+
+        try:
+            if meterings:
+                await self.hass.async_add_executor_job(self.archive.append, meterings)
+
+            if compact:
+                self._compacted_at = now
+                removed = await self.hass.async_add_executor_job(
+                    self.archive.compact,
+                    int(dt_util.utcnow().timestamp()) - ARCHIVE_RETENTION,
+                )
+                if removed:
+                    LOGGER.debug("Removed %s meterings from the history", removed)
+        except (OSError, ValueError) as exception:
+            self._warning("archive", exception)
+
+    def _finish_update(
+        self, summary: FoxInsightsUpdateSummary, started_at: float
+    ) -> None:
+        """Update the counters and log a summary of the update.
+
+        :param summary: The summary of the update.
+        :param started_at: The monotonic time when the update was started.
+        """
+        summary.duration = time.monotonic() - started_at
+        self.last_update_summary = summary
+        self.device_updates_changed += summary.changed
+        self.device_updates_unchanged += summary.unchanged
+
+        LOGGER.debug(
+            "Update finished: devices=%s, changed=%s, unchanged=%s, validation_errors=%s, failed_accounts=%s, failed=%s, duration=%.3fs",
+            summary.devices,
+            summary.changed,
+            summary.unchanged,
+            summary.validation_errors,
+            summary.failed_accounts,
+            summary.failed,
+            summary.duration,
+        )
+
+    async def async_demand_refresh(self, hwids: Iterable[str] | None = None) -> None:
+        """Refresh the data on demand and wait until the new data has been applied.
+
+        Concurrent calls share a single refresh. Refreshes are delayed until the cooldown since the last demanded refresh has passed.
+        The refresh is polled through the scheduler, so that it respects the global cap and never overlaps a scheduled poll.
+
+        :param hwids: The hardware IDs of the devices to fetch or None to fetch the list of all devices.
+        """
+        while self._demand_refresh_task is not None and self._demand_refresh_running:
+            await asyncio.shield(self._demand_refresh_task)
+
+        if hwids is None:
+            self._force_full_sync = True
+        else:
+            self._forced_hwids.update(hwids)
+
+        if self._demand_refresh_task is None:
+            delay = 0.0
+            if self._demand_refreshed_at is not None:
+                delay = self._demand_refreshed_at + REFRESH_COOLDOWN - time.monotonic()
+
+            self._demand_refresh_task = self.hass.async_create_task(
+                self._async_demand_refresh(delay)
+            )
+
+        await asyncio.shield(self._demand_refresh_task)
+
+    async def _async_demand_refresh(self, delay: float) -> None:
+        """Wait for the given delay and refresh the data.
+
+        :param delay: The number of seconds to wait before refreshing.
+        """
+        try:
+            if delay > 0:
+                LOGGER.debug("Delaying demanded refresh by %.1fs", delay)
+                try:
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    # the entry was unloaded, waiting callers return without a refresh
+                    return
+
+            self._demand_refresh_running = True
+            if self.scheduler is not None and self.config_entry is not None:
+                await self.scheduler.async_request(self.config_entry.entry_id)
+            else:
+                await self.async_refresh()
+        finally:
+            self._demand_refreshed_at = time.monotonic()
+            self._demand_refresh_running = False
+            self._demand_refresh_task = None
+
+    @callback
+    def async_add_estimate_listener(
+        self, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for the ticks of the estimate timer, which is shared by all estimated sensors of the entry.
+
+        :param update_callback: The function to call on every tick while the data is available.
+        :return: a function which removes the listener.
+        """
+
+        @callback
+        def remove_listener() -> None:
+            self._estimate_listeners.pop(update_callback, None)
+            if not self._estimate_listeners and self._unsub_estimate is not None:
+                self._unsub_estimate()
+                self._unsub_estimate = None
+
+        self._estimate_listeners[update_callback] = None
+        if self._unsub_estimate is None:
+            self._unsub_estimate = async_track_time_interval(
+                self.hass,
+                self._async_update_estimates,
+                timedelta(seconds=ESTIMATE_INTERVAL),
+            )
+
+        return remove_listener
+
+    @callback
+    def _async_update_estimates(self, _now: datetime) -> None:
+        """Notify the estimate listeners on every tick of the timer."""
+        if self.unavailable:
+            return
+
+        for update_callback in list(self._estimate_listeners):
+            update_callback()
+
+    def _warning(self, key: str, message: Any) -> None:
+        """Log a warning at most once per interval for the given key.
+
+        :param key: The key used to group similar warnings.
+        :param message: The message to log.
+        """
+        now = time.monotonic()
+        last_warning = self._warning_times.get(key)
+        if last_warning is not None and now - last_warning < WARNING_INTERVAL:
+            LOGGER.debug(message)
+            return
+
+        self._warning_times[key] = now
+        LOGGER.warning(message)
+
+    def has_due_devices(self) -> bool:
+        """Check if the next metering of a device became due since the last poll.
+
+        :return: True if a poll would fetch new meterings, False otherwise.
+        """
+        if self._polled_at is None:
+            return False
+
+        utcnow = dt_util.utcnow()
+
+        return any(
+            next_metering is not None and self._polled_at < next_metering <= utcnow
+            for next_metering in self._next_metering.values()
+        )
+
+    def is_debug_enabled(self, device: FoxInsightsDevice) -> bool:
+        """Check if detailed debug logging is enabled for the given device.
+
+        :param device: The device to check.
+        :return: True if debug messages should be logged for the device, False otherwise.
+        """
+        return device.hwid in self.debug_hwids and LOGGER.isEnabledFor(logging.DEBUG)
+
     def is_unavailable(self) -> bool:
         """Check if the data is unavailable.
 
@@ -0,0 +1,211 @@
+"""Streaming detection of refills and anomalies in the fill levels of devices."""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from .api import FoxInsightsDevice
+from .const import (
+    ANOMALY_MIN_SAMPLES,
+    ANOMALY_THRESHOLD,
+    EVENT_LEAK_SUSPECTED,
+    EVENT_REFILL,
+    EVENT_SENSOR_JUMP,
+    EWMA_ALPHA,
+    LEAK_MAX_CONSECUTIVE,
+    REFILL_MIN_PERCENT,
+    REFILL_MIN_QUANTITY,
+)
+
+
+@dataclass
+class FoxInsightsDeviceStatistics:
+    """Online statistics of the consumption rate of a single device."""
+
+    metering_at: datetime
+    quantity: int
+    capacity: int | None
+    mean: float = 0.0
+    variance: float = 0.0
+    samples: int = 0
+    leaks: int = 0
+
+    def add(self, rate: float) -> None:
+        """Add a consumption rate to the exponentially weighted mean and variance.
+
+        :param rate: The consumption rate per day.
+        """
+        if self.samples == 0:
+            self.mean = rate
+        else:
+            diff = rate - self.mean
+            increment = EWMA_ALPHA * diff
+            self.mean += increment
+            self.variance = (1 - EWMA_ALPHA) * (self.variance + diff * increment)
+
+        self.samples += 1
+
+    @property
+    def noise(self) -> float:
+        """Return the expected deviation of the consumption rate."""
+        return max(math.sqrt(self.variance), 0.1 * abs(self.mean), 1.0)
+
+
+def _get_capacity(quantity: int, percent: int | None) -> int | None:
+    """Return the tank volume derived from a fill level.
+
+    :param quantity: The fill level quantity.
+    :param percent: The fill level in percent.
+    :return: The tank volume or None if it cannot be derived.
+    """
+    if percent is None or percent <= 0 or quantity <= 0:
+        return None
+
+    return round(quantity * 100 / percent)
+
+
+class FoxInsightsAnomalyDetector:
+    """Detector which looks at the fill level of each device once per metering and keeps constant memory per device."""
+
+    def __init__(self) -> None:
+        """Initialize the object."""
+        self._statistics: dict[str, FoxInsightsDeviceStatistics] = {}
+
+    def update(self, device: FoxInsightsDevice) -> list[tuple[str, dict[str, Any]]]:
+        """Process a new metering of a device.
+
+        :param device: The device with a new metering.
+        :return: a list of event types and event data to fire.
+        """
+        try:
+            metering_at = datetime.fromisoformat(device.currentMeteringAt)
+            quantity = int(device.fillLevelQuantity)
+            percent = (
+                int(device.fillLevelPercent)
+                if device.fillLevelPercent is not None
+                else None
+            )
+        except (TypeError, ValueError):
+            return []
+
+        event = self._add(device.hwid, metering_at, quantity, percent)
+        if event is None:
+            return []
+
+        event_type, event_data = event
+        return [
+            (
+                event_type,
+                {"hwid": device.hwid}
+                | event_data
+                | {
+                    "unit": device.quantityUnit,
+                    "metering_at": device.currentMeteringAt,
+                },
+            )
+        ]
+
+    def seed(
+        self,
+        hwid: str,
+        timestamps: list[int],
+        quantities: list[int],
+        percents: list[int | None],
+    ) -> None:
+        """Replay archived meterings of a device without firing events, so that its consumption rate is known at startup.
+
+        :param hwid: The hardware ID of the device.
+        :param timestamps: The UNIX timestamps of the meterings in ascending order.
+        :param quantities: The fill level quantities of the meterings.
+        :param percents: The fill levels of the meterings in percent.
+        """
+        for timestamp, quantity, percent in zip(timestamps, quantities, percents):
+            self._add(
+                hwid, datetime.fromtimestamp(timestamp, timezone.utc), quantity, percent
+            )
+
+    def _add(
+        self, hwid: str, metering_at: datetime, quantity: int, percent: int | None
+    ) -> tuple[str, dict[str, Any]] | None:
+        """Add a metering of a device to its statistics and classify it.
+
+        :param hwid: The hardware ID of the device.
+        :param metering_at: The time of the metering.
+        :param quantity: The fill level quantity.
+        :param percent: The fill level in percent.
+        :return: the event type and the data of the metering or None if the metering is not an event.
+        """
+        capacity = _get_capacity(quantity, percent)
+        statistics = self._statistics.get(hwid)
+        if statistics is None:
+            self._statistics[hwid] = FoxInsightsDeviceStatistics(
+                metering_at, quantity, capacity
+            )
+            return None
+
+        days = (metering_at - statistics.metering_at).total_seconds() / 86400
+        if days <= 0:
+            return None
+
+        event_data = {"previous_quantity": statistics.quantity, "quantity": quantity}
+        rate = (statistics.quantity - quantity) / days
+        event = None
+
+        # a refill raises the quantity by a share of the tank volume, smaller increases are sensor jumps
+        if capacity is None:
+            capacity = statistics.capacity
+        min_refill = (
+            capacity * REFILL_MIN_PERCENT / 100
+            if capacity is not None
+            else REFILL_MIN_QUANTITY
+        )
+
+        if quantity - statistics.quantity >= min_refill:
+            event = (EVENT_REFILL, event_data)
+        elif (
+            statistics.samples >= ANOMALY_MIN_SAMPLES
+            and -rate > ANOMALY_THRESHOLD * statistics.noise
+        ):
+            event = (EVENT_SENSOR_JUMP, event_data)
+        elif (
+            statistics.samples >= ANOMALY_MIN_SAMPLES
+            and rate - statistics.mean > ANOMALY_THRESHOLD * statistics.noise
+            and statistics.leaks < LEAK_MAX_CONSECUTIVE
+        ):
+            # not added to the statistics, so that a leak does not raise the expected rate, unless the rate stays
+            # high for more consecutive meterings than a leak would be reported
+            statistics.leaks += 1
+            event = (
+                EVENT_LEAK_SUSPECTED,
+                event_data | {"rate": rate, "expected_rate": statistics.mean},
+            )
+        else:
+            statistics.leaks = 0
+            statistics.add(rate)
+
+        statistics.metering_at = metering_at
+        statistics.quantity = quantity
+        statistics.capacity = capacity
+
+        return event
+
+    def consumption_rate(self, hwid: str) -> float | None:
+        """Return the expected consumption rate of a device.
+
+        :param hwid: The hardware ID of the device.
+        :return: The consumption per day or None if no rate was computed yet.
+        """
+        statistics = self._statistics.get(hwid)
+        if statistics is None or statistics.samples == 0:
+            return None
+
+        return max(statistics.mean, 0.0)
+
+    def remove(self, hwid: str) -> None:
+        """Forget the statistics of a device which no longer exists.
+
+        :param hwid: The hardware ID of the device.
+        """
+        self._statistics.pop(hwid, None)
@@ -0,0 +1,97 @@
+"""Registration of FoxInsights devices in the device registry."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.entity import DeviceInfo
+
+from .api import FoxInsightsDevice
+from .const import DOMAIN, LOGGER, NAME
+
+
+def _get_attributes(device: FoxInsightsDevice) -> dict[str, Any]:
+    """Return the attributes of a device as stored in the device registry.
+
+    :param device: The device.
+    :return: The attributes.
+    """
+    return {
+        "name": NAME + " " + device.hwid,
+        "serial_number": device.hwid,
+        "manufacturer": NAME,
+    }
+
+
+class FoxInsightsDeviceRegistrar:
+    """Registers each device once and writes changed attributes only.
+
+    Entities refer to the registered devices by identifiers only, so that Home Assistant does not process the full
+    device information once per entity.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry | None) -> None:
+        """Initialize the object."""
+        self.hass = hass
+        self.entry = entry
+        self._attributes: dict[str, dict[str, Any]] = {}
+        self._device_infos: dict[str, DeviceInfo] = {}
+
+    def get_device_info(self, hwid: str) -> DeviceInfo:
+        """Return the device information shared by all entities of a device.
+
+        :param hwid: The hardware ID of the device.
+        :return: The device information.
+        """
+        device_info = self._device_infos.get(hwid)
+        if device_info is None:
+            device_info = DeviceInfo(identifiers={(DOMAIN, hwid)})
+            self._device_infos[hwid] = device_info
+
+        return device_info
+
+    @callback
+    def async_register(self, devices: Iterable[FoxInsightsDevice]) -> None:
+        """Create or update the registry entries of devices whose attributes changed.
+
+        :param devices: The devices.
+        """
+        if self.entry is None:
+            return
+
+        registry = None
+        for device in devices:
+            attributes = _get_attributes(device)
+            if self._attributes.get(device.hwid) == attributes:
+                continue
+
+            if registry is None:
+                registry = dr.async_get(self.hass)
+
+            identifiers = {(DOMAIN, device.hwid)}
+            registry_entry = registry.async_get_device(identifiers=identifiers)
+            if registry_entry is None:
+                registry.async_get_or_create(
+                    config_entry_id=self.entry.entry_id,
+                    identifiers=identifiers,
+                    **attributes,
+                )
+            else:
+                changes = {
+                    key: value
+                    for key, value in attributes.items()
+                    if getattr(registry_entry, key) != value
+                }
+                if self.entry.entry_id not in registry_entry.config_entries:
+                    changes["add_config_entry_id"] = self.entry.entry_id
+
+                if changes:
+                    LOGGER.debug(
+                        "Updating device %s: %s", device.hwid, ", ".join(changes)
+                    )
+                    registry.async_update_device(registry_entry.id, **changes)
+
+            self._attributes[device.hwid] = attributes
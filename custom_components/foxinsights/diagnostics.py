@@ -0,0 +1,112 @@
+"""Diagnostics support for FoxInsights."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_EMAIL, CONF_PASSWORD, DOMAIN, POLL_INTERVAL
+from .coordinator import FoxInsightsDataUpdateCoordinator
+from .scheduler import FoxInsightsPollScheduler
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD, "title", "unique_id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    scheduler: FoxInsightsPollScheduler = hass.data[DOMAIN]
+    coordinator: FoxInsightsDataUpdateCoordinator = scheduler.coordinators[
+        entry.entry_id
+    ]
+    now = dt_util.utcnow()
+    account_numbers = {api.email: index for index, api in enumerate(coordinator.apis)}
+
+    devices = {}
+    for hwid, device in (coordinator.data or {}).items():
+        devices[hwid] = {
+            "data": asdict(device) | {"account": account_numbers.get(device.account)},
+            "version": coordinator.device_versions.get(hwid, 0),
+            "staleness": _staleness(device.currentMeteringAt, now),
+        }
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "unavailable": coordinator.is_unavailable(),
+            "last_update_success": coordinator.last_update_success,
+            "last_update_summary": (
+                asdict(coordinator.last_update_summary)
+                if coordinator.last_update_summary is not None
+                else None
+            ),
+            "poll_interval": POLL_INTERVAL,
+            "next_poll": scheduler.next_poll(entry.entry_id),
+        },
+        "accounts": [
+            {
+                "account": index,
+                "token_age": api.token_age,
+                "oversized_responses": api.oversized_responses,
+                "requests": [
+                    asdict(statistics) for statistics in api.request_statistics
+                ],
+                "validation": {
+                    "accepted": api.validator.accepted,
+                    "rejects": dict(api.validator.rejects),
+                    "quarantined_count": api.validator.quarantined_count,
+                    "quarantined": list(api.validator.quarantined),
+                },
+            }
+            for index, api in enumerate(coordinator.apis)
+        ],
+        "devices": devices,
+        "ratios": {
+            "unchanged_device_updates": _ratio(
+                coordinator.device_updates_unchanged,
+                coordinator.device_updates_changed,
+            ),
+            "suppressed_state_writes": _ratio(
+                coordinator.state_writes_suppressed,
+                coordinator.state_writes_emitted,
+            ),
+        },
+    }
+
+
+def _staleness(metering_at: str | None, now: datetime) -> float | None:
+    """Return the number of seconds since the given metering.
+
+    :param metering_at: The time of the metering in ISO format.
+    :param now: The current time.
+    :return: The age of the metering or None if the time is unknown.
+    """
+    if metering_at is None:
+        return None
+
+    try:
+        return (now - datetime.fromisoformat(metering_at)).total_seconds()
+    except (TypeError, ValueError):
+        return None
+
+
+def _ratio(hits: int, misses: int) -> dict[str, Any]:
+    """Return the hit ratio of a counter pair.
+
+    :param hits: The number of hits.
+    :param misses: The number of misses.
+    :return: a dictionary with both counters and the ratio of hits.
+    """
+    total = hits + misses
+
+    return {
+        "hits": hits,
+        "misses": misses,
+        "ratio": hits / total if total > 0 else None,
+    }
@@ -1,16 +1,98 @@
 """FoxInsightsEntity class."""
 from __future__ import annotations
 
-from homeassistant.components.sensor import RestoreSensor
+import abc
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorEntity,
+    SensorExtraStoredData,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api import FoxInsightsDevice
-from .const import DOMAIN, NAME
+from .const import CONF_SHOW_CONSUMPTION_ATTRIBUTES, DOMAIN, LOGGER, NAME
 from .coordinator import FoxInsightsDataUpdateCoordinator
 
 
-class FoxInsightsEntity(CoordinatorEntity, RestoreSensor):
+class FoxInsightsWriteSuppressionMixin:
+    """Mixin which counts the state writes of an entity and skips writes which would not change the state.
+
+    Numeric values which changed by less than the configured deadband are not written either.
+    """
+
+    coordinator: FoxInsightsDataUpdateCoordinator
+    _deadband_option: str | None = None
+    _deadband_default: float = 0
+    _written_state: tuple[bool, Any, dict[str, Any]] | None = None
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state to the state machine and remember what was written."""
+        self._written_state = self._render_state()
+        self.coordinator.state_writes_emitted += 1
+        super().async_write_ha_state()
+
+    @callback
+    def _async_write_ha_state_if_changed(self) -> None:
+        """Write the state only if it differs from the last written state.
+
+        Numeric values which changed by less than the configured deadband are reset to the last written value.
+        """
+        if self._written_state is not None:
+            written_value = self._written_state[1]
+            if self._is_within_deadband(written_value, self._attr_native_value):
+                self._attr_native_value = written_value
+
+            if self._render_state() == self._written_state:
+                self.coordinator.state_writes_suppressed += 1
+                return
+
+        self.async_write_ha_state()
+
+    def _render_state(self) -> tuple[bool, Any, dict[str, Any]]:
+        """Return a snapshot of everything which ends up in the state machine.
+
+        :return: a tuple of the availability, the native value and a copy of the extra state attributes.
+        """
+        return (
+            self.available,
+            self._attr_native_value,
+            dict(getattr(self, "_attr_extra_state_attributes", None) or {}),
+        )
+
+    def _is_within_deadband(self, written_value: Any, value: Any) -> bool:
+        """Check if a numeric value differs from the written value by less than the deadband.
+
+        :param written_value: The last written value.
+        :param value: The new value.
+        :return: True if the change is too small to be written, False otherwise.
+        """
+        if self._deadband_option is None:
+            return False
+
+        if not isinstance(written_value, int | float) or not isinstance(
+            value, int | float
+        ):
+            return False
+
+        deadband = float(
+            self.coordinator.config_entry.options.get(
+                self._deadband_option, self._deadband_default
+            )
+        )
+
+        return 0 < abs(value - written_value) < deadband
+
+
+class FoxInsightsEntity(
+    FoxInsightsWriteSuppressionMixin, CoordinatorEntity, RestoreSensor
+):
     """Class representing a FoxInsights entity."""
 
     def __init__(
@@ -24,14 +106,160 @@ class FoxInsightsEntity(CoordinatorEntity, RestoreSensor):
         self._attr_native_value = None
         self._attr_extra_state_attributes = {}
 
+        # the device is registered by the platform before the entities are added
+        self._attr_device_info = coordinator.devices.get_device_info(device.hwid)
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return not self.coordinator.is_unavailable()
+
+    def _log_debug(self, message: str, *args: Any) -> None:
+        """Log a debug message if detailed logging is enabled for the device of the entity.
+
+        :param message: The message to log.
+        :param args: The arguments for the message.
+        """
+        if self.coordinator.is_debug_enabled(self.device):
+            LOGGER.debug(message, *args)
+
+
+@dataclass
+class FoxInsightsConsumptionExtraStoredData(SensorExtraStoredData):
+    """Object to hold the extra stored data of a consumption sensor."""
+
+    previous_value: int
+    current_value: int
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the consumption sensor data."""
+        data = super().as_dict()
+        data["previous_value"] = self.previous_value
+        data["current_value"] = self.current_value
+
+        return data
+
+    @classmethod
+    def from_dict(
+        cls, restored: dict[str, Any]
+    ) -> FoxInsightsConsumptionExtraStoredData | None:
+        """Initialize a stored consumption sensor state from a dict."""
+        sensor_data = SensorExtraStoredData.from_dict(restored)
+        if sensor_data is None:
+            return None
+
+        try:
+            return cls(
+                sensor_data.native_value,
+                sensor_data.native_unit_of_measurement,
+                int(restored["previous_value"]),
+                int(restored["current_value"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+class FoxInsightsConsumptionEntity(FoxInsightsEntity):
+    """Class representing a FoxInsights entity which accumulates the consumption between meterings.
+
+    The last two fill levels are kept out of the state attributes and are persisted as extra restore data instead.
+    They are only exposed as unrecorded attributes if enabled in the options.
+    """
+
+    _unrecorded_attributes = frozenset({"previous_value", "current_value"})
+
+    def __init__(
+        self, coordinator: FoxInsightsDataUpdateCoordinator, device: FoxInsightsDevice
+    ):
+        """Initialize the object."""
+        super().__init__(coordinator, device)
+
+        self._previous_value: int = 0
+        self._current_value: int = 0
+
+    @property
+    def extra_restore_state_data(self) -> FoxInsightsConsumptionExtraStoredData:
+        """Return the consumption specific state data to be restored."""
+        return FoxInsightsConsumptionExtraStoredData(
+            self.native_value,
+            self.native_unit_of_measurement,
+            self._previous_value,
+            self._current_value,
+        )
+
+    async def async_restore_consumption_values(self) -> None:
+        """Restore the last two fill levels.
+
+        Falls back to the state attributes written by previous versions of the integration.
+        """
+        restored_data = await self.async_get_last_extra_data()
+        if restored_data is not None:
+            consumption_data = FoxInsightsConsumptionExtraStoredData.from_dict(
+                restored_data.as_dict()
+            )
+            if consumption_data is not None:
+                self._previous_value = consumption_data.previous_value
+                self._current_value = consumption_data.current_value
+                return
+
+        last_state = await self.async_get_last_state()
+        if last_state is not None:
+            self._previous_value = int(last_state.attributes.get("previous_value") or 0)
+            self._current_value = int(last_state.attributes.get("current_value") or 0)
+
+    def _update_consumption_attributes(self) -> None:
+        """Expose the last two fill levels as attributes if enabled in the options."""
+        if not self.coordinator.config_entry.options.get(
+            CONF_SHOW_CONSUMPTION_ATTRIBUTES, False
+        ):
+            self._attr_extra_state_attributes = {}
+            return
+
+        self._attr_extra_state_attributes = {
+            "previous_value": self._previous_value,
+            "current_value": self._current_value,
+        }
+
+
+class FoxInsightsAccountEntity(
+    FoxInsightsWriteSuppressionMixin, CoordinatorEntity, SensorEntity
+):
+    """Class representing a FoxInsights entity which aggregates all devices of all accounts of a config entry."""
+
+    def __init__(self, coordinator: FoxInsightsDataUpdateCoordinator, key: str):
+        """Initialize the object."""
+        super().__init__(coordinator)
+
+        entry = coordinator.config_entry
+        self._attr_unique_id = NAME + "-" + entry.entry_id + "-" + key
+        self._attr_native_value = None
+
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, device.hwid)},
-            name=NAME + " " + device.hwid,
-            serial_number=device.hwid,
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=NAME + " " + entry.title,
             manufacturer=NAME,
+            entry_type=DeviceEntryType.SERVICE,
         )
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
         return not self.coordinator.is_unavailable()
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+
+        self._attr_native_value = self._compute_value()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._attr_native_value = self._compute_value()
+        self._async_write_ha_state_if_changed()
+
+    @abc.abstractmethod
+    def _compute_value(self) -> Any:
+        """Return the current value of the aggregate.
+
+        :return: The value read from the aggregates of the coordinator.
+        """
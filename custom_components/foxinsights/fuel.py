@@ -0,0 +1,147 @@
+"""Conversion of consumed fuel quantities to energy."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .api import FoxInsightsDevice
+from .const import CONF_DEVICE_FUEL_TYPES, CONF_FUEL_TYPE, FUEL_TYPE_AUTO, LOGGER
+
+KWH_PER_L_HEATING_OIL_EXTRA_LIGHT = 10.08
+KWH_PER_KG_HEATING_OIL_EXTRA_LIGHT = 11.86
+KWH_PER_L_BIODIESEL = 9.17
+KWH_PER_KG_BIODIESEL = 10.33
+
+
+def _blend(bio_share: float) -> dict[str, float]:
+    """Return the energy content of heating oil EL blended with a share of biodiesel (FAME).
+
+    :param bio_share: The share of biodiesel by volume.
+    :return: The energy content in kWh per unit.
+    """
+    return {
+        "L": KWH_PER_L_HEATING_OIL_EXTRA_LIGHT * (1 - bio_share)
+        + KWH_PER_L_BIODIESEL * bio_share,
+        "kg": KWH_PER_KG_HEATING_OIL_EXTRA_LIGHT * (1 - bio_share)
+        + KWH_PER_KG_BIODIESEL * bio_share,
+    }
+
+
+# fuel type -> energy content in kWh per quantity unit
+FUELS: dict[str, dict[str, float]] = {
+    "heating_oil_el": {
+        "L": KWH_PER_L_HEATING_OIL_EXTRA_LIGHT,
+        "kg": KWH_PER_KG_HEATING_OIL_EXTRA_LIGHT,
+    },
+    "heating_oil_el_b10": _blend(0.1),
+    "heating_oil_el_b20": _blend(0.2),
+    "biodiesel": {"L": KWH_PER_L_BIODIESEL, "kg": KWH_PER_KG_BIODIESEL},
+    "pellets": {"kg": 4.9},
+    "lpg": {"L": 6.57, "kg": 12.87},
+}
+
+# quantity unit -> fuel type if the fuel type is not configured
+DEFAULT_FUELS = {"L": "heating_oil_el", "kg": "pellets"}
+
+
+@dataclass(frozen=True)
+class FoxInsightsEnergyConverter:
+    """Converter from the quantity unit of a device to kWh with a resolved factor."""
+
+    fuel: str
+    unit: str
+    factor: float
+
+    def convert(self, quantity: float) -> float:
+        """Return the energy of a quantity.
+
+        :param quantity: The quantity in the unit of the device.
+        :return: The energy in kWh.
+        """
+        return self.factor * quantity
+
+    def convert_many(self, quantities: Iterable[float]) -> list[float]:
+        """Return the energy of many quantities, for example the consumption per period.
+
+        :param quantities: The quantities in the unit of the device.
+        :return: The energies in kWh.
+        """
+        factor = self.factor
+        return [factor * quantity for quantity in quantities]
+
+
+def _parse_device_fuel_types(value: str) -> dict[str, str]:
+    """Parse the fuel types selected per device.
+
+    :param value: Semicolon-separated overrides in the format "HWID=fuel".
+    :return: a dictionary mapping the hardware IDs to their fuel types.
+    """
+    result = {}
+    for override in value.split(";"):
+        hwid, separator, fuel = override.partition("=")
+        if hwid.strip() == "":
+            continue
+
+        if separator == "" or fuel.strip() not in FUELS:
+            LOGGER.warning("Ignoring invalid fuel type selection: %s", override)
+            continue
+
+        result[hwid.strip()] = fuel.strip()
+
+    return result
+
+
+class FoxInsightsFuelTable:
+    """Fuel types of all devices which resolves one converter per device."""
+
+    def __init__(
+        self, fuel_type: str = FUEL_TYPE_AUTO, device_fuel_types: str = ""
+    ) -> None:
+        """Initialize the object.
+
+        :param fuel_type: The fuel type of all devices or FUEL_TYPE_AUTO to select it by the quantity unit.
+        :param device_fuel_types: Overrides per device in the format "HWID=fuel;HWID=fuel".
+        """
+        self.fuel_type = fuel_type if fuel_type in FUELS else FUEL_TYPE_AUTO
+        self.device_fuel_types = _parse_device_fuel_types(device_fuel_types)
+        self._converters: dict[tuple[str, str], FoxInsightsEnergyConverter] = {}
+
+    @classmethod
+    def init_from_options(cls, options: Mapping[str, Any]) -> FoxInsightsFuelTable:
+        """Create object from the options of a config entry."""
+        return cls(
+            options.get(CONF_FUEL_TYPE, FUEL_TYPE_AUTO),
+            options.get(CONF_DEVICE_FUEL_TYPES, ""),
+        )
+
+    def get_converter(self, device: FoxInsightsDevice) -> FoxInsightsEnergyConverter:
+        """Return the converter of a device.
+
+        Fuel types which are not measured in the unit of the device fall back to the default fuel of the unit.
+
+        :param device: The device.
+        :return: The converter.
+        """
+        unit = "kg" if device.quantityUnit == "kg" else "L"
+        converter = self._converters.get((device.hwid, unit))
+        if converter is not None:
+            return converter
+
+        fuel = self.device_fuel_types.get(device.hwid, self.fuel_type)
+        if fuel == FUEL_TYPE_AUTO:
+            fuel = DEFAULT_FUELS[unit]
+        elif unit not in FUELS[fuel]:
+            LOGGER.warning(
+                "Fuel type %s of device %s is not measured in %s, using %s instead",
+                fuel,
+                device.hwid,
+                unit,
+                DEFAULT_FUELS[unit],
+            )
+            fuel = DEFAULT_FUELS[unit]
+
+        converter = FoxInsightsEnergyConverter(fuel, unit, FUELS[fuel][unit])
+        self._converters[(device.hwid, unit)] = converter
+
+        return converter
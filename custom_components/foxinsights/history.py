@@ -0,0 +1,309 @@
+"""On-disk fill level history of devices."""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Any
+
+# timestamp, quantity, percent (-1 if unknown)
+RECORD = struct.Struct("<qii")
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+
+
+class _SegmentTimestamps:
+    """Read-only sequence of the timestamps in a memory-mapped segment used for binary searches."""
+
+    def __init__(self, buffer: memoryview) -> None:
+        """Initialize the object."""
+        self._buffer = buffer
+        self._count = len(buffer) // RECORD.size
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return self._count
+
+    def __getitem__(self, index: int) -> int:
+        """Return the timestamp of the record with the given index."""
+        return RECORD.unpack_from(self._buffer, index * RECORD.size)[0]
+
+
+def _downsample(
+    records: list[tuple[int, int, int]], max_points: int
+) -> dict[str, list[int | None]]:
+    """Reduce the records to the given number of points by averaging equally sized buckets.
+
+    :return: a dictionary with the columns "t", "quantity" and "percent".
+    """
+    count = len(records)
+    result: dict[str, list[int | None]] = {"t": [], "quantity": [], "percent": []}
+
+    for bucket in range(max_points):
+        bucket_records = records[
+            bucket * count // max_points : (bucket + 1) * count // max_points
+        ]
+        size = len(bucket_records)
+        known_percents = [record[2] for record in bucket_records if record[2] >= 0]
+
+        result["t"].append(sum(record[0] for record in bucket_records) // size)
+        result["quantity"].append(
+            round(sum(record[1] for record in bucket_records) / size)
+        )
+        result["percent"].append(
+            round(sum(known_percents) / len(known_percents)) if known_percents else None
+        )
+
+    return result
+
+
+class FoxInsightsHistoryArchive:
+    """Append-only archive of meterings with one fixed-width binary segment per device.
+
+    The index file maps the hardware IDs to their segment files. Segments are read through mmap without decoding
+    anything but the requested range. All methods do blocking I/O and must be called from an executor.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the object.
+
+        :param path: The directory of the archive.
+        """
+        self.path = path
+        self._segments: dict[str, str] | None = None
+        self._last_timestamps: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def append(self, records: list[tuple[str, int, int, int | None]]) -> int:
+        """Append meterings to the segments of their devices.
+
+        Meterings which are not newer than the last archived metering of a device are ignored. A partial record at
+        the end of a segment is removed before appending.
+
+        :param records: A list of hardware IDs, UNIX timestamps, quantities and percentages.
+        :return: The number of appended meterings.
+        """
+        appended = 0
+
+        with self._lock:
+            segments = self._load_index()
+            index_changed = False
+
+            for hwid, timestamp, quantity, percent in records:
+                segment = segments.get(hwid)
+                if segment is None:
+                    segment = segments[hwid] = (
+                        hashlib.sha1(hwid.encode("utf-8")).hexdigest() + ".seg"
+                    )
+                    index_changed = True
+
+                path = os.path.join(self.path, segment)
+                last_timestamp = self._last_timestamps.get(hwid)
+                if last_timestamp is None:
+                    last_timestamp = self._read_last_timestamp(path)
+
+                if last_timestamp is not None and timestamp <= last_timestamp:
+                    continue
+
+                with open(path, "ab") as file:
+                    # drop a partial record left by an interrupted write, so that the new record stays aligned
+                    size = file.seek(0, os.SEEK_END)
+                    if size % RECORD.size:
+                        file.truncate(size - size % RECORD.size)
+                    file.write(
+                        RECORD.pack(
+                            timestamp, quantity, -1 if percent is None else percent
+                        )
+                    )
+
+                self._last_timestamps[hwid] = timestamp
+                appended += 1
+
+            if index_changed:
+                self._write_index(segments)
+
+        return appended
+
+    def query(
+        self,
+        hwids: list[str] | None,
+        start: int | None = None,
+        end: int | None = None,
+        max_points: int | None = None,
+    ) -> dict[str, dict[str, list[int | None]]]:
+        """Return the archived meterings of the given devices as columns.
+
+        :param hwids: The hardware IDs of the devices or None for all devices.
+        :param start: The earliest UNIX timestamp to return (optional).
+        :param end: The latest UNIX timestamp to return (optional).
+        :param max_points: The maximum number of points per device (optional).
+        :return: a dictionary mapping the hardware IDs to the columns "t", "quantity" and "percent".
+        """
+        with self._lock:
+            segments = dict(self._load_index())
+
+        if hwids is None:
+            hwids = list(segments)
+
+        result = {}
+        for hwid in hwids:
+            segment = segments.get(hwid)
+            if segment is None:
+                continue
+
+            records = self._scan(os.path.join(self.path, segment), start, end)
+
+            if max_points is not None and len(records) > max_points:
+                result[hwid] = _downsample(records, max_points)
+            else:
+                result[hwid] = {
+                    "t": [record[0] for record in records],
+                    "quantity": [record[1] for record in records],
+                    "percent": [
+                        record[2] if record[2] >= 0 else None for record in records
+                    ],
+                }
+
+        return result
+
+    def compact(self, min_timestamp: int) -> int:
+        """Remove meterings older than the given timestamp and segments which became empty.
+
+        Segments are rewritten to a temporary file which replaces the segment atomically.
+
+        :param min_timestamp: The earliest UNIX timestamp to keep.
+        :return: The number of removed meterings.
+        """
+        removed = 0
+
+        with self._lock:
+            segments = self._load_index()
+
+            for hwid, segment in list(segments.items()):
+                path = os.path.join(self.path, segment)
+                size = os.path.getsize(path) if os.path.exists(path) else 0
+                size -= size % RECORD.size
+                if size == 0:
+                    continue
+
+                with open(path, "rb") as file, mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                ) as mapped:
+                    buffer = memoryview(mapped)[:size]
+                    try:
+                        first = bisect_left(_SegmentTimestamps(buffer), min_timestamp)
+                        remaining = buffer[first * RECORD.size :].tobytes()
+                    finally:
+                        buffer.release()
+
+                if first == 0:
+                    continue
+
+                removed += first
+                if remaining:
+                    with open(path + ".tmp", "wb") as file:
+                        file.write(remaining)
+                    os.replace(path + ".tmp", path)
+                else:
+                    os.remove(path)
+                    del segments[hwid]
+                    self._last_timestamps.pop(hwid, None)
+
+            if removed:
+                self._write_index(segments)
+
+        return removed
+
+    def _scan(
+        self, path: str, start: int | None, end: int | None
+    ) -> list[tuple[int, int, int]]:
+        """Read the records of a segment in the given time range.
+
+        :param path: The path of the segment file.
+        :param start: The earliest UNIX timestamp to return (optional).
+        :param end: The latest UNIX timestamp to return (optional).
+        :return: a list of timestamps, quantities and percentages.
+        """
+        try:
+            file = open(path, "rb")  # noqa: SIM115
+        except FileNotFoundError:
+            return []
+
+        with file:
+            size = os.fstat(file.fileno()).st_size
+            size -= size % RECORD.size
+            if size == 0:
+                return []
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                buffer = memoryview(mapped)[:size]
+                try:
+                    timestamps = _SegmentTimestamps(buffer)
+                    first = 0 if start is None else bisect_left(timestamps, start)
+                    last = (
+                        len(timestamps)
+                        if end is None
+                        else bisect_right(timestamps, end)
+                    )
+                    return list(
+                        RECORD.iter_unpack(
+                            buffer[first * RECORD.size : last * RECORD.size]
+                        )
+                    )
+                finally:
+                    buffer.release()
+
+    def _read_last_timestamp(self, path: str) -> int | None:
+        """Read the timestamp of the last complete record of a segment.
+
+        :param path: The path of the segment file.
+        :return: The timestamp or None if the segment is empty.
+        """
+        try:
+            with open(path, "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                size -= size % RECORD.size
+                if size == 0:
+                    return None
+
+                file.seek(size - RECORD.size)
+                return RECORD.unpack(file.read(RECORD.size))[0]
+        except FileNotFoundError:
+            return None
+
+    def _load_index(self) -> dict[str, str]:
+        """Load the index which maps the hardware IDs to their segment files.
+
+        :return: The cached or loaded index.
+        """
+        if self._segments is not None:
+            return self._segments
+
+        os.makedirs(self.path, exist_ok=True)
+
+        segments: dict[str, Any] = {}
+        try:
+            with open(os.path.join(self.path, INDEX_FILE), encoding="utf-8") as file:
+                index = json.load(file)
+            if index.get("version") == INDEX_VERSION:
+                segments = index.get("segments", {})
+        except FileNotFoundError:
+            pass
+
+        self._segments = segments
+
+        return segments
+
+    def _write_index(self, segments: dict[str, str]) -> None:
+        """Replace the index file atomically.
+
+        :param segments: The mapping of hardware IDs to segment files.
+        """
+        path = os.path.join(self.path, INDEX_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump({"version": INDEX_VERSION, "segments": segments}, file)
+        os.replace(path + ".tmp", path)
@@ -0,0 +1,64 @@
+"""Profiling of coordinator refreshes."""
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+
+from .const import PROFILE_TOP_FUNCTIONS
+
+
+class FoxInsightsProfiler:
+    """Profiler which aggregates the statistics of a number of coordinator refreshes."""
+
+    def __init__(self, path: str, refreshes: int) -> None:
+        """Initialize the object.
+
+        :param path: The path of the file to write the statistics to.
+        :param refreshes: The number of refreshes to profile.
+        """
+        self.path = path
+        self.remaining = refreshes
+        self.enabled = False
+        self._profile = cProfile.Profile()
+
+    def enable(self) -> bool:
+        """Start collecting statistics.
+
+        :return: True if statistics are collected, False if another profiler is active.
+        """
+        if not self.enabled:
+            try:
+                self._profile.enable()
+            except ValueError:
+                return False
+            self.enabled = True
+
+        return True
+
+    def disable(self) -> bool:
+        """Stop collecting statistics at the end of a refresh.
+
+        :return: True if all requested refreshes were profiled, False otherwise.
+        """
+        if self.enabled:
+            self._profile.disable()
+            self.enabled = False
+            self.remaining -= 1
+
+        return self.remaining <= 0
+
+    def write(self) -> str:
+        """Write the statistics to the file and return a report of the top functions.
+
+        Writes files synchronously and must not be called from the event loop.
+
+        :return: The top functions by cumulative time.
+        """
+        self._profile.dump_stats(self.path)
+
+        report = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_FUNCTIONS)
+
+        return report.getvalue()
@@ -0,0 +1,145 @@
+"""Rolling consumption totals per device for calendar periods."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .const import HEATING_SEASON_START_MONTH
+
+PERIODS = ("day", "week", "month", "heating_season")
+
+
+def period_start(period: str, moment: datetime) -> datetime:
+    """Return the start of the period which contains the given moment in local time.
+
+    Weeks start on Monday. Heating seasons start on the first day of HEATING_SEASON_START_MONTH.
+
+    :param period: One of the PERIODS.
+    :param moment: The moment.
+    :return: The start of the period.
+    """
+    local = dt_util.as_local(moment)
+    midnight = {"hour": 0, "minute": 0, "second": 0, "microsecond": 0}
+
+    if period == "day":
+        return local.replace(**midnight)
+
+    if period == "week":
+        return (local - timedelta(days=local.weekday())).replace(**midnight)
+
+    if period == "month":
+        return local.replace(day=1, **midnight)
+
+    if period == "heating_season":
+        year = (
+            local.year if local.month >= HEATING_SEASON_START_MONTH else local.year - 1
+        )
+        return local.replace(
+            year=year, month=HEATING_SEASON_START_MONTH, day=1, **midnight
+        )
+
+    raise ValueError(period)
+
+
+def aggregate_consumption(
+    timestamps: list[int], quantities: list[int], period: str
+) -> dict[str, list[int]]:
+    """Sum the consumption between consecutive meterings per period.
+
+    Refills are not counted. The consumption between two meterings is added to the period of the later metering.
+
+    :param timestamps: The UNIX timestamps of the meterings in ascending order.
+    :param quantities: The fill level quantities of the meterings.
+    :param period: One of the PERIODS.
+    :return: a dictionary with the columns "t" (UNIX timestamps of the period starts) and "consumption".
+    """
+    result: dict[str, list[int]] = {"t": [], "consumption": []}
+
+    previous_quantity = None
+    for timestamp, quantity in zip(timestamps, quantities):
+        start = int(
+            period_start(period, dt_util.utc_from_timestamp(timestamp)).timestamp()
+        )
+        if not result["t"] or result["t"][-1] != start:
+            result["t"].append(start)
+            result["consumption"].append(0)
+
+        if previous_quantity is not None and previous_quantity > quantity:
+            result["consumption"][-1] += previous_quantity - quantity
+
+        previous_quantity = quantity
+
+    return result
+
+
+@dataclass
+class FoxInsightsPeriodTotal:
+    """Consumption total of the current period."""
+
+    start: datetime
+    total: int = 0
+
+
+class FoxInsightsConsumptionRollups:
+    """Rolling consumption totals of all devices which are updated incrementally with each metering."""
+
+    def __init__(self) -> None:
+        """Initialize the object."""
+        self._meterings: dict[str, tuple[int, int]] = {}
+        self._totals: dict[str, dict[str, FoxInsightsPeriodTotal]] = {}
+
+    def update(self, hwid: str, timestamp: int, quantity: int) -> None:
+        """Add the consumption since the previous metering of a device to the current periods.
+
+        Meterings which are not newer than the previous metering are ignored.
+
+        :param hwid: The hardware ID of the device.
+        :param timestamp: The time of the metering as a UNIX timestamp.
+        :param quantity: The fill level quantity.
+        """
+        previous = self._meterings.get(hwid)
+        if previous is not None and timestamp <= previous[0]:
+            return
+
+        self._meterings[hwid] = (timestamp, quantity)
+
+        consumption = 0
+        if previous is not None and previous[1] > quantity:
+            consumption = previous[1] - quantity
+
+        metering_at = dt_util.utc_from_timestamp(timestamp)
+        totals = self._totals.setdefault(hwid, {})
+        for period in PERIODS:
+            start = period_start(period, metering_at)
+            current = totals.get(period)
+            if current is None or current.start != start:
+                totals[period] = FoxInsightsPeriodTotal(start, consumption)
+            else:
+                current.total += consumption
+
+    def total(self, hwid: str, period: str, now: datetime) -> int | None:
+        """Return the consumption of a device in the current period.
+
+        :param hwid: The hardware ID of the device.
+        :param period: One of the PERIODS.
+        :param now: The current time.
+        :return: The consumption or None if there was no metering yet.
+        """
+        current = self._totals.get(hwid, {}).get(period)
+        if current is None:
+            return None
+
+        if current.start != period_start(period, now):
+            return 0
+
+        return current.total
+
+    def remove(self, hwid: str) -> None:
+        """Forget the totals of a device which no longer exists.
+
+        :param hwid: The hardware ID of the device.
+        """
+        self._meterings.pop(hwid, None)
+        self._totals.pop(hwid, None)
@@ -0,0 +1,232 @@
+"""Domain-wide poll scheduler for FoxInsights."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    LOGGER,
+    MAX_CONCURRENT_POLLS,
+    POLL_INTERVAL,
+    PULL_FORWARD_COOLDOWN,
+    SCHEDULER_TICK,
+)
+from .coordinator import FoxInsightsDataUpdateCoordinator
+
+if TYPE_CHECKING:
+    from .profiler import FoxInsightsProfiler
+
+_T = TypeVar("_T")
+
+
+def _entry_hash(entry_id: str) -> int:
+    """Return a hash of the config entry ID which is stable across restarts."""
+    return int.from_bytes(hashlib.sha1(entry_id.encode("utf-8")).digest()[:8], "big")
+
+
+class FoxInsightsPollScheduler:
+    """Scheduler which polls the coordinators of all config entries.
+
+    Each entry gets a deterministic slot within the poll interval so that the entries are spread evenly instead of
+    polling in lockstep. The number of polls in flight is capped globally. Entries with devices whose next metering
+    is due are polled before their slot. While a profiler is set, polls run one at a time so that its statistics
+    only cover a single refresh.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the object."""
+        self.hass = hass
+        self._coordinators: dict[str, FoxInsightsDataUpdateCoordinator] = {}
+        self._offsets: dict[str, float] = {}
+        self._next_polls: dict[str, float] = {}
+        self._pulled_forward_at: dict[str, float] = {}
+        self._polls: dict[str, asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+        self._profile_lock = asyncio.Lock()
+        self.profiler: FoxInsightsProfiler | None = None
+        self._unsub_tick: CALLBACK_TYPE | None = None
+
+    @property
+    def coordinators(self) -> dict[str, FoxInsightsDataUpdateCoordinator]:
+        """Return the scheduled coordinators mapped by their config entry ID."""
+        return self._coordinators
+
+    @callback
+    def async_add(
+        self, entry_id: str, coordinator: FoxInsightsDataUpdateCoordinator
+    ) -> None:
+        """Schedule the coordinator of a config entry.
+
+        :param entry_id: The ID of the config entry.
+        :param coordinator: The coordinator to poll.
+        """
+        self._coordinators[entry_id] = coordinator
+        coordinator.scheduler = self
+        self._update_offsets()
+
+        if self._unsub_tick is None:
+            self._unsub_tick = async_track_time_interval(
+                self.hass, self._async_tick, timedelta(seconds=SCHEDULER_TICK)
+            )
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Stop polling the coordinator of a config entry.
+
+        :param entry_id: The ID of the config entry.
+        """
+        coordinator = self._coordinators.pop(entry_id, None)
+        if coordinator is not None:
+            coordinator.scheduler = None
+        self._pulled_forward_at.pop(entry_id, None)
+        self._update_offsets()
+
+        if not self._coordinators and self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+
+    async def async_run(self, job: Callable[[], Awaitable[_T]]) -> _T:
+        """Run a poll outside of the schedule while respecting the global cap.
+
+        :param job: The function which polls.
+        :return: The result of the job.
+        """
+        async with self._semaphore:
+            return await job()
+
+    async def async_request(self, entry_id: str) -> None:
+        """Poll a config entry on demand and wait until the poll has finished.
+
+        The poll respects the global cap like a scheduled poll. If a poll of the entry is already in flight, it is
+        awaited first and the entry is polled again, because the running poll may have started before the demand.
+
+        :param entry_id: The ID of the config entry.
+        """
+        while (task := self._polls.get(entry_id)) is not None:
+            await asyncio.shield(task)
+
+        coordinator = self._coordinators.get(entry_id)
+        if coordinator is None:
+            return
+
+        task = self.hass.async_create_task(self._async_poll(entry_id, coordinator))
+        self._polls[entry_id] = task
+        await asyncio.shield(task)
+
+    def next_poll(self, entry_id: str) -> datetime | None:
+        """Return the time of the next scheduled poll of a config entry.
+
+        :param entry_id: The ID of the config entry.
+        :return: The time of the next poll or None if the entry is not scheduled.
+        """
+        next_poll = self._next_polls.get(entry_id)
+        if next_poll is None:
+            return None
+
+        return datetime.fromtimestamp(next_poll).astimezone()
+
+    def _update_offsets(self) -> None:
+        """Distribute the slots of all entries evenly over the poll interval.
+
+        Entries are ordered by a stable hash so that the slots only depend on the set of configured entries.
+        """
+        entry_ids = sorted(self._coordinators, key=_entry_hash)
+        count = len(entry_ids)
+        now = time.time()
+
+        self._offsets = {
+            entry_id: index * POLL_INTERVAL / count
+            for index, entry_id in enumerate(entry_ids)
+        }
+        self._next_polls = {
+            entry_id: self._next_slot(entry_id, now) for entry_id in entry_ids
+        }
+
+    def _next_slot(self, entry_id: str, now: float) -> float:
+        """Return the start of the next slot of an entry after the given time.
+
+        :param entry_id: The ID of the config entry.
+        :param now: The current UNIX timestamp.
+        """
+        offset = self._offsets[entry_id]
+
+        return (math.floor((now - offset) / POLL_INTERVAL) + 1) * POLL_INTERVAL + offset
+
+    async def _async_tick(self, _now: Any = None) -> None:
+        """Start the polls of all entries which are due."""
+        now = time.time()
+        monotonic_now = time.monotonic()
+
+        for entry_id, coordinator in self._coordinators.items():
+            if entry_id in self._polls:
+                continue
+
+            if now >= self._next_polls[entry_id]:
+                self._next_polls[entry_id] = self._next_slot(entry_id, now)
+            elif coordinator.has_due_devices() and (
+                monotonic_now - self._pulled_forward_at.get(entry_id, -math.inf)
+                >= PULL_FORWARD_COOLDOWN
+            ):
+                LOGGER.debug("Pulling forward poll of entry %s", entry_id)
+                self._pulled_forward_at[entry_id] = monotonic_now
+            else:
+                continue
+
+            self._polls[entry_id] = self.hass.async_create_task(
+                self._async_poll(entry_id, coordinator)
+            )
+
+    async def _async_poll(
+        self, entry_id: str, coordinator: FoxInsightsDataUpdateCoordinator
+    ) -> None:
+        """Poll a coordinator once a slot under the global cap is free.
+
+        :param entry_id: The ID of the config entry.
+        :param coordinator: The coordinator to poll.
+        """
+        try:
+            async with self._semaphore:
+                if self._coordinators.get(entry_id) is coordinator:
+                    if self.profiler is None:
+                        await coordinator.async_refresh()
+                    else:
+                        await self._async_profile(coordinator)
+        finally:
+            self._polls.pop(entry_id, None)
+
+    async def _async_profile(
+        self, coordinator: FoxInsightsDataUpdateCoordinator
+    ) -> None:
+        """Refresh a coordinator with the profiler enabled and write the statistics once it is finished.
+
+        :param coordinator: The coordinator to refresh.
+        """
+        async with self._profile_lock:
+            profiler = self.profiler
+            if profiler is None:
+                await coordinator.async_refresh()
+                return
+
+            if not profiler.enable():
+                LOGGER.warning("Profiling stopped, another profiler is already active")
+                self.profiler = None
+                await coordinator.async_refresh()
+                return
+
+            try:
+                await coordinator.async_refresh()
+            finally:
+                finished = profiler.disable()
+
+            if finished and self.profiler is profiler:
+                self.profiler = None
+                report = await self.hass.async_add_executor_job(profiler.write)
+                LOGGER.info("Profile written to %s:\n%s", profiler.path, report)
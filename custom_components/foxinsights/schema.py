@@ -0,0 +1,136 @@
+"""Validation of device items returned by the FoxInsights API."""
+from __future__ import annotations
+
+from collections import Counter, deque
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from .const import QUARANTINE_SIZE
+
+
+def _to_str(value: Any) -> str:
+    """Return the value if it is a non-empty string."""
+    if not isinstance(value, str):
+        raise TypeError(value)
+
+    if value == "":
+        raise ValueError(value)
+
+    return value
+
+
+def _to_int(value: Any) -> int:
+    """Coerce numbers and numeric strings to an integer."""
+    if isinstance(value, bool):
+        raise TypeError(value)
+
+    if isinstance(value, int):
+        return value
+
+    if isinstance(value, float):
+        return round(value)
+
+    if isinstance(value, str):
+        return round(float(value))
+
+    raise TypeError(value)
+
+
+def _to_timestamp(value: Any) -> str:
+    """Return the value if it is a timestamp in ISO format."""
+    if not isinstance(value, str):
+        raise TypeError(value)
+
+    datetime.fromisoformat(value)
+
+    return value
+
+
+def parse_timestamp(value: str | None) -> datetime | None:
+    """Parse a timestamp returned by the API.
+
+    :param value: The timestamp in ISO format.
+    :return: The parsed timestamp or None if it is invalid. Timestamps without timezone are assumed to be in UTC.
+    """
+    if value is None:
+        return None
+
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+
+    return parsed
+
+
+# field name, converter, required
+DEVICE_SCHEMA: tuple[tuple[str, Callable[[Any], Any], bool], ...] = (
+    ("hwid", _to_str, True),
+    ("currentMeteringAt", _to_timestamp, False),
+    ("nextMeteringAt", _to_timestamp, False),
+    ("daysReach", _to_int, False),
+    ("validationError", _to_str, False),
+    ("batteryLevel", _to_str, False),
+    ("fillLevelPercent", _to_int, False),
+    ("fillLevelQuantity", _to_int, False),
+    ("quantityUnit", _to_str, False),
+)
+
+
+class FoxInsightsDeviceValidator:
+    """Validator which checks and coerces each device item exactly once.
+
+    Invalid optional fields are replaced with None. Items which are not objects or lack a valid hardware ID are quarantined.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the object."""
+        self.rejects: Counter[str] = Counter()
+        self.accepted: int = 0
+        self.quarantined: deque[Any] = deque(maxlen=QUARANTINE_SIZE)
+        self.quarantined_count: int = 0
+
+    def validate(self, item: Any) -> dict[str, Any] | None:
+        """Validate a single device item.
+
+        :param item: The decoded device item.
+        :return: a dictionary with the coerced fields or None if the item was quarantined.
+        """
+        if not isinstance(item, dict):
+            self.rejects["item"] += 1
+            return self._quarantine(item)
+
+        values = {}
+        for name, converter, required in DEVICE_SCHEMA:
+            value = item.get(name)
+            if value is not None:
+                try:
+                    value = converter(value)
+                except (TypeError, ValueError, OverflowError):
+                    self.rejects[name] += 1
+                    value = None
+            elif required:
+                self.rejects[name] += 1
+
+            if value is None and required:
+                return self._quarantine(item)
+
+            values[name] = value
+
+        self.accepted += 1
+
+        return values
+
+    def _quarantine(self, item: Any) -> None:
+        """Remember an item which could not be validated.
+
+        :param item: The rejected item.
+        """
+        self.quarantined_count += 1
+        self.quarantined.append(item)
+
+        return None
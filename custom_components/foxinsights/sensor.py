@@ -2,39 +2,221 @@
 
 from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
-from .coordinator import FoxInsightsDataUpdateCoordinator
-from .sensors.BatteryLevelSensor import BatteryLevelSensor
-from .sensors.CurrentMeteringAtSensor import CurrentMeteringAtSensor
-from .sensors.DaysReachSensor import DaysReachSensor
-from .sensors.EnergyConsumptionSensor import EnergyConsumptionSensor
-from .sensors.FillLevelPercentSensor import FillLevelPercentSensor
-from .sensors.FillLevelQuantitySensor import FillLevelQuantitySensor
-from .sensors.MaterialConsumptionSensor import MaterialConsumptionSensor
-from .sensors.NextMeteringAtSensor import NextMeteringAtSensor
-from .sensors.ValidationErrorSensor import ValidationErrorSensor
+from . import async_import_modules
+from .const import (
+    CONF_ACCOUNT_SENSORS,
+    CONF_CONSUMPTION_ROLLUPS,
+    CONF_DEVICE_SENSOR_KINDS,
+    CONF_ESTIMATED_FILL_LEVEL,
+    CONF_SENSOR_KINDS,
+    DOMAIN,
+    LEGACY_SENSOR_KINDS,
+    LOGGER,
+    NAME,
+    SENSOR_KINDS,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import FoxInsightsDataUpdateCoordinator
+    from .entity import FoxInsightsEntity
+
+# sensor kind -> module in the sensors package and class name, suffix of the unique ID
+SENSOR_CLASSES: dict[str, tuple[str, str]] = {
+    "fill_level_quantity": ("FillLevelQuantitySensor", "fillLevelQuantity"),
+    "fill_level_percent": ("FillLevelPercentSensor", "fillLevelPercent"),
+    "battery_level": ("BatteryLevelSensor", "batteryLevel"),
+    "last_measurement": ("CurrentMeteringAtSensor", "lastMeasurement"),
+    "next_measurement": ("NextMeteringAtSensor", "nextMeasurement"),
+    "material_consumption": ("MaterialConsumptionSensor", "materialConsumption"),
+    "energy_consumption": ("EnergyConsumptionSensor", "energyConsumption"),
+    "days_reach": ("DaysReachSensor", "daysReach"),
+    "validation_error": ("ValidationErrorSensor", "validationError"),
+}
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up sensors."""
-    coordinator: FoxInsightsDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator: FoxInsightsDataUpdateCoordinator = hass.data[DOMAIN].coordinators[
+        entry.entry_id
+    ]
     entities = []
 
+    sensor_kinds = {
+        LEGACY_SENSOR_KINDS.get(kind, kind)
+        for kind in entry.options.get(CONF_SENSOR_KINDS, SENSOR_KINDS)
+    }
+    device_sensor_kinds = _parse_device_sensor_kinds(
+        entry.options.get(CONF_DEVICE_SENSOR_KINDS, "")
+    )
+    unselected_unique_ids = set()
+
+    await async_import_modules(
+        hass,
+        _get_sensor_modules(entry, sensor_kinds.union(*device_sensor_kinds.values())),
+    )
+
+    # register each device once instead of once per entity and keep the registry up to date
+    coordinator.devices.async_register(coordinator.data.values())
+    entry.async_on_unload(
+        coordinator.async_add_listener(
+            lambda: coordinator.devices.async_register(
+                device
+                for device in coordinator.data.values()
+                if coordinator.update_flag.get(device.hwid, False)
+            )
+        )
+    )
+
     for device in coordinator.data.values():
-        entities.append(FillLevelQuantitySensor(coordinator, device))
-        entities.append(FillLevelPercentSensor(coordinator, device))
-        entities.append(BatteryLevelSensor(coordinator, device))
-        entities.append(CurrentMeteringAtSensor(coordinator, device))
-        entities.append(NextMeteringAtSensor(coordinator, device))
-        entities.append(MaterialConsumptionSensor(coordinator, device))
-        entities.append(EnergyConsumptionSensor(coordinator, device))
-        entities.append(DaysReachSensor(coordinator, device))
-        entities.append(ValidationErrorSensor(coordinator, device))
+        kinds = device_sensor_kinds.get(device.hwid, sensor_kinds)
+        for kind in SENSOR_KINDS:
+            if kind in kinds:
+                entities.append(_get_sensor_class(kind)(coordinator, device))
+            else:
+                unselected_unique_ids.add(
+                    NAME + "-" + device.hwid + "-" + SENSOR_CLASSES[kind][1]
+                )
+
+        if entry.options.get(CONF_ESTIMATED_FILL_LEVEL, False):
+            from .sensors.EstimatedFillLevelSensor import EstimatedFillLevelSensor
+
+            entities.append(EstimatedFillLevelSensor(coordinator, device))
+
+        if entry.options.get(CONF_CONSUMPTION_ROLLUPS, False):
+            from .rollup import PERIODS
+            from .sensors.ConsumptionRollupSensor import ConsumptionRollupSensor
+
+            for period in PERIODS:
+                entities.append(ConsumptionRollupSensor(coordinator, device, period))
+
+    if entry.options.get(CONF_ACCOUNT_SENSORS, False):
+        from .sensors.AccountFillLevelPercentSensor import (
+            AccountFillLevelPercentSensor,
+        )
+        from .sensors.AccountLowBatteryCountSensor import AccountLowBatteryCountSensor
+        from .sensors.AccountMinDaysReachSensor import AccountMinDaysReachSensor
+        from .sensors.AccountTotalQuantitySensor import AccountTotalQuantitySensor
+        from .sensors.AccountValidationErrorCountSensor import (
+            AccountValidationErrorCountSensor,
+        )
+
+        for unit in coordinator.aggregate.units:
+            entities.append(AccountTotalQuantitySensor(coordinator, unit))
+            entities.append(AccountFillLevelPercentSensor(coordinator, unit))
+        entities.append(AccountMinDaysReachSensor(coordinator))
+        entities.append(AccountValidationErrorCountSensor(coordinator))
+        entities.append(AccountLowBatteryCountSensor(coordinator))
+
+    _remove_unselected_entities(hass, entry, unselected_unique_ids)
 
     async_add_entities(entities)
+
+
+def _get_sensor_modules(entry: ConfigEntry, kinds: set[str]) -> list[str]:
+    """Return the modules of all selected sensors.
+
+    Only these modules are imported, so that kinds which are not selected are never loaded.
+
+    :param entry: The config entry.
+    :param kinds: The sensor kinds selected for any device.
+    :return: The names of the modules relative to the integration package.
+    """
+    modules = [
+        ".sensors." + SENSOR_CLASSES[kind][0] for kind in SENSOR_KINDS if kind in kinds
+    ]
+
+    if entry.options.get(CONF_ESTIMATED_FILL_LEVEL, False):
+        modules.append(".sensors.EstimatedFillLevelSensor")
+
+    if entry.options.get(CONF_CONSUMPTION_ROLLUPS, False):
+        modules += [".rollup", ".sensors.ConsumptionRollupSensor"]
+
+    if entry.options.get(CONF_ACCOUNT_SENSORS, False):
+        modules += [
+            ".sensors.AccountFillLevelPercentSensor",
+            ".sensors.AccountLowBatteryCountSensor",
+            ".sensors.AccountMinDaysReachSensor",
+            ".sensors.AccountTotalQuantitySensor",
+            ".sensors.AccountValidationErrorCountSensor",
+        ]
+
+    return modules
+
+
+def _get_sensor_class(kind: str) -> type[FoxInsightsEntity]:
+    """Return the class of a sensor kind.
+
+    The module was imported in the executor by async_setup_entry and is taken from the module cache.
+
+    :param kind: The sensor kind.
+    :return: The sensor class.
+    """
+    name = SENSOR_CLASSES[kind][0]
+    module = importlib.import_module(".sensors." + name, __package__)
+
+    return getattr(module, name)
+
+
+def _parse_device_sensor_kinds(value: str) -> dict[str, set[str]]:
+    """Parse the sensor kinds selected per device.
+
+    Sensor kinds in the camelCase format of previous versions are accepted as well.
+
+    :param value: Semicolon-separated overrides in the format "HWID=kind,kind".
+    :return: a dictionary mapping the hardware IDs to their selected sensor kinds.
+    """
+    result = {}
+    for override in value.split(";"):
+        hwid, separator, kinds = override.partition("=")
+        if hwid.strip() == "":
+            continue
+
+        if separator == "":
+            LOGGER.warning("Ignoring invalid sensor selection: %s", override)
+            continue
+
+        selected = {
+            LEGACY_SENSOR_KINDS.get(kind.strip(), kind.strip())
+            for kind in kinds.split(",")
+            if kind.strip() != ""
+        }
+        unknown = selected - set(SENSOR_KINDS)
+        if unknown:
+            LOGGER.warning(
+                "Ignoring unknown sensor kinds for %s: %s",
+                hwid.strip(),
+                ", ".join(sorted(unknown)),
+            )
+
+        result[hwid.strip()] = selected - unknown
+
+    return result
+
+
+def _remove_unselected_entities(
+    hass: HomeAssistant, entry: ConfigEntry, unique_ids: set[str]
+) -> None:
+    """Remove registry entries of sensors which were created before but are no longer selected.
+
+    :param hass: The Home Assistant instance.
+    :param entry: The config entry.
+    :param unique_ids: The unique IDs of the unselected sensors.
+    """
+    if not unique_ids:
+        return
+
+    registry = er.async_get(hass)
+    for registry_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if registry_entry.unique_id in unique_ids:
+            LOGGER.debug("Removing unselected sensor %s", registry_entry.entity_id)
+            registry.async_remove(registry_entry.entity_id)
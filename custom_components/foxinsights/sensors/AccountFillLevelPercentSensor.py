@@ -0,0 +1,29 @@
+"""Sensor for the capacity-weighted fill level of all accounts of a config entry."""
+from __future__ import annotations
+
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.const import PERCENTAGE
+
+from ..const import NAME
+from ..coordinator import FoxInsightsDataUpdateCoordinator
+from ..entity import FoxInsightsAccountEntity
+
+
+class AccountFillLevelPercentSensor(FoxInsightsAccountEntity):
+    """Sensor for the capacity-weighted fill level of all accounts of a config entry."""
+
+    def __init__(self, coordinator: FoxInsightsDataUpdateCoordinator, unit: str):
+        """Initialize."""
+        super().__init__(coordinator, "fillLevelPercent-" + unit)
+        self.unit = unit
+
+        self._attr_name = (
+            NAME + " " + coordinator.config_entry.title + " fill level percent " + unit
+        )
+        self._attr_icon = "mdi:percent"
+        self._attr_native_unit_of_measurement = PERCENTAGE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_device_class = None
+
+    def _compute_value(self) -> float | None:
+        return self.coordinator.aggregate.fill_level_percent(self.unit)
@@ -0,0 +1,25 @@
+"""Sensor for the number of devices of all accounts of a config entry with a low battery."""
+from __future__ import annotations
+
+from ..const import NAME
+from ..coordinator import FoxInsightsDataUpdateCoordinator
+from ..entity import FoxInsightsAccountEntity
+
+
+class AccountLowBatteryCountSensor(FoxInsightsAccountEntity):
+    """Sensor for the number of devices of all accounts of a config entry with a low battery."""
+
+    def __init__(self, coordinator: FoxInsightsDataUpdateCoordinator):
+        """Initialize."""
+        super().__init__(coordinator, "lowBatteryCount")
+
+        self._attr_name = (
+            NAME + " " + coordinator.config_entry.title + " devices with low battery"
+        )
+        self._attr_icon = "mdi:battery-alert"
+        self._attr_native_unit_of_measurement = None
+        self._attr_state_class = None
+        self._attr_device_class = None
+
+    def _compute_value(self) -> int:
+        return self.coordinator.aggregate.low_battery_count
@@ -0,0 +1,27 @@
+"""Sensor for the smallest days reach of all accounts of a config entry."""
+from __future__ import annotations
+
+from homeassistant.const import UnitOfTime
+
+from ..const import NAME
+from ..coordinator import FoxInsightsDataUpdateCoordinator
+from ..entity import FoxInsightsAccountEntity
+
+
+class AccountMinDaysReachSensor(FoxInsightsAccountEntity):
+    """Sensor for the smallest days reach of all accounts of a config entry."""
+
+    def __init__(self, coordinator: FoxInsightsDataUpdateCoordinator):
+        """Initialize."""
+        super().__init__(coordinator, "minDaysReach")
+
+        self._attr_name = (
+            NAME + " " + coordinator.config_entry.title + " minimum days reach"
+        )
+        self._attr_icon = "mdi:calendar-range"
+        self._attr_native_unit_of_measurement = UnitOfTime.DAYS
+        self._attr_state_class = None
+        self._attr_device_class = None
+
+    def _compute_value(self) -> int | None:
+        return self.coordinator.aggregate.min_days_reach()
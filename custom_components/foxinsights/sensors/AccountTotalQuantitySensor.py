@@ -0,0 +1,33 @@
+"""Sensor for the total fill level quantity of all accounts of a config entry."""
+from __future__ import annotations
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import UnitOfMass, UnitOfVolume
+
+from ..const import NAME
+from ..coordinator import FoxInsightsDataUpdateCoordinator
+from ..entity import FoxInsightsAccountEntity
+
+
+class AccountTotalQuantitySensor(FoxInsightsAccountEntity):
+    """Sensor for the total fill level quantity of all accounts of a config entry."""
+
+    def __init__(self, coordinator: FoxInsightsDataUpdateCoordinator, unit: str):
+        """Initialize."""
+        super().__init__(coordinator, "totalQuantity-" + unit)
+        self.unit = unit
+
+        self._attr_name = (
+            NAME + " " + coordinator.config_entry.title + " total quantity " + unit
+        )
+        self._attr_icon = "mdi:hydraulic-oil-level"
+        self._attr_native_unit_of_measurement = UnitOfVolume.LITERS
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_device_class = SensorDeviceClass.VOLUME_STORAGE
+
+        if unit == "kg":
+            self._attr_native_unit_of_measurement = UnitOfMass.KILOGRAMS
+            self._attr_device_class = SensorDeviceClass.WEIGHT
+
+    def _compute_value(self) -> int | None:
+        return self.coordinator.aggregate.total_quantity(self.unit)
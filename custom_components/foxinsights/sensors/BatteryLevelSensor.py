@@ -6,7 +6,7 @@ from homeassistant.const import PERCENTAGE, STATE_UNAVAILABLE
 from homeassistant.core import callback
 
 from ..api import FoxInsightsDevice
-from ..const import LOGGER, NAME
+from ..const import NAME
 from ..coordinator import FoxInsightsDataUpdateCoordinator
 from ..entity import FoxInsightsEntity
 
@@ -46,20 +46,20 @@ class BatteryLevelSensor(FoxInsightsEntity):
 
             if last_sensor_data is not None:
                 self._attr_native_value = last_sensor_data.native_value
-                LOGGER.debug(
+                self._log_debug(
                     "Restored value for batteryLevel from data: %s",
                     self._attr_native_value,
                 )
             else:
                 try:
                     self._attr_native_value = str(last_state.state)
-                    LOGGER.debug(
+                    self._log_debug(
                         "Restored value for batteryLevel from state: %s",
                         self._attr_native_value,
                     )
                 except ValueError:
                     self._attr_native_value = None
-                    LOGGER.debug(
+                    self._log_debug(
                         "Invalid stored value for batteryLevel: %s", last_state.state
                     )
 
@@ -75,21 +75,21 @@ class BatteryLevelSensor(FoxInsightsEntity):
         data = self.coordinator.get_data(self.device)
         if data is None or data.batteryLevel is None:
             self._attr_native_value = None
-            LOGGER.debug("Data for batteryLevel not available")
+            self._log_debug("Data for batteryLevel not available")
         else:
             try:
                 self._attr_native_value = self.battery_mapping[data.batteryLevel]
-                LOGGER.debug(
+                self._log_debug(
                     "Update batteryLevel for HWID %s with value: %s",
                     self.device.hwid,
                     self._attr_native_value,
                 )
             except KeyError:
-                LOGGER.debug(
+                self._log_debug(
                     "Invalid value for batteryLevel for HWID %s: %s",
                     self.device.hwid,
                     data.batteryLevel,
                 )
 
-        self.async_write_ha_state()
+        self._async_write_ha_state_if_changed()
         return None
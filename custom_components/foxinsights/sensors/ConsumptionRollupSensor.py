@@ -0,0 +1,101 @@
+"""Sensor for the consumption in the current period."""
+from __future__ import annotations
+
+from datetime import datetime
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import UnitOfMass, UnitOfVolume
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.util import dt as dt_util
+
+from ..api import FoxInsightsDevice
+from ..const import NAME
+from ..coordinator import FoxInsightsDataUpdateCoordinator
+from ..entity import FoxInsightsEntity
+from ..rollup import period_start
+
+PERIOD_NAMES = {
+    "day": "daily",
+    "week": "weekly",
+    "month": "monthly",
+    "heating_season": "heating season",
+}
+
+
+class ConsumptionRollupSensor(FoxInsightsEntity):
+    """Sensor for the consumption in the current day, week, month or heating season.
+
+    The totals are kept by the coordinator and reset locally at the start of each period.
+    """
+
+    def __init__(
+        self,
+        coordinator: FoxInsightsDataUpdateCoordinator,
+        device: FoxInsightsDevice,
+        period: str,
+    ):
+        """Initialize."""
+        super().__init__(coordinator, device)
+
+        self.period = period
+
+        self._attr_unique_id = (
+            NAME + "-" + self.device.hwid + "-consumption-" + period.replace("_", "-")
+        )
+        self._attr_name = (
+            NAME + " " + self.device.hwid + " " + PERIOD_NAMES[period] + " consumption"
+        )
+        self._attr_icon = "mdi:chart-bar"
+        self._attr_native_unit_of_measurement = UnitOfVolume.LITERS
+        self._attr_state_class = SensorStateClass.TOTAL
+        self._attr_device_class = SensorDeviceClass.VOLUME
+
+        if device.quantityUnit == "kg":
+            self._attr_native_unit_of_measurement = UnitOfMass.KILOGRAMS
+            self._attr_device_class = SensorDeviceClass.WEIGHT
+
+    @property
+    def last_reset(self) -> datetime:
+        """Return the start of the current period."""
+        return period_start(self.period, dt_util.utcnow())
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+
+        # all periods start at local midnight
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._async_reset, hour=0, minute=0, second=0
+            )
+        )
+
+        self._update_total()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if not self.coordinator.needs_update(self.device):
+            return None
+
+        self._update_total()
+        return None
+
+    @callback
+    def _async_reset(self, now: datetime) -> None:
+        """Reset the total at the start of a new period."""
+        self._update_total()
+
+    def _update_total(self) -> None:
+        """Read the total of the current period and write the state."""
+        self._attr_native_value = self.coordinator.rollups.total(
+            self.device.hwid, self.period, dt_util.utcnow()
+        )
+        self._log_debug(
+            "Update %s consumption for HWID %s with value: %s",
+            self.period,
+            self.device.hwid,
+            self._attr_native_value,
+        )
+
+        self._async_write_ha_state_if_changed()
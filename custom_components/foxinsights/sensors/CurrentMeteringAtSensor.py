@@ -8,7 +8,7 @@ from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.core import callback
 
 from ..api import FoxInsightsDevice
-from ..const import LOGGER, NAME
+from ..const import NAME
 from ..coordinator import FoxInsightsDataUpdateCoordinator
 from ..entity import FoxInsightsEntity
 
@@ -40,20 +40,20 @@ class CurrentMeteringAtSensor(FoxInsightsEntity):
 
             if last_sensor_data is not None:
                 self._attr_native_value = last_sensor_data.native_value
-                LOGGER.debug(
+                self._log_debug(
                     "Restored value for currentMeteringAt from data: %s",
                     self._attr_native_value,
                 )
             else:
                 try:
                     self._attr_native_value = datetime.fromisoformat(last_state.state)
-                    LOGGER.debug(
+                    self._log_debug(
                         "Restored value for currentMeteringAt from state: %s",
                         self._attr_native_value,
                     )
                 except ValueError:
                     self._attr_native_value = None
-                    LOGGER.debug(
+                    self._log_debug(
                         "Invalid stored value for currentMeteringAt: %s",
                         last_state.state,
                     )
@@ -70,21 +70,21 @@ class CurrentMeteringAtSensor(FoxInsightsEntity):
         data = self.coordinator.get_data(self.device)
         if data is None or data.currentMeteringAt is None:
             self._attr_native_value = None
-            LOGGER.debug("Data for currentMeteringAt not available")
+            self._log_debug("Data for currentMeteringAt not available")
         else:
             try:
                 self._attr_native_value = datetime.fromisoformat(data.currentMeteringAt)
-                LOGGER.debug(
+                self._log_debug(
                     "Update currentMeteringAt for HWID %s with value: %s",
                     self.device.hwid,
                     self._attr_native_value,
                 )
-            except KeyError:
-                LOGGER.debug(
+            except (TypeError, ValueError):
+                self._log_debug(
                     "Invalid value for currentMeteringAt for HWID %s: %s",
                     self.device.hwid,
                     data.currentMeteringAt,
                 )
 
-        self.async_write_ha_state()
+        self._async_write_ha_state_if_changed()
         return None
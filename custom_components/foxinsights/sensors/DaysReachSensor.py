@@ -5,7 +5,7 @@ from homeassistant.const import STATE_UNAVAILABLE, UnitOfTime
 from homeassistant.core import callback
 
 from ..api import FoxInsightsDevice
-from ..const import LOGGER, NAME
+from ..const import NAME
 from ..coordinator import FoxInsightsDataUpdateCoordinator
 from ..entity import FoxInsightsEntity
 
@@ -37,20 +37,20 @@ class DaysReachSensor(FoxInsightsEntity):
 
             if last_sensor_data is not None:
                 self._attr_native_value = last_sensor_data.native_value
-                LOGGER.debug(
+                self._log_debug(
                     "Restored value for daysReach from data: %s",
                     self._attr_native_value,
                 )
             else:
                 try:
                     self._attr_native_value = int(last_state.state)
-                    LOGGER.debug(
+                    self._log_debug(
                         "Restored value for daysReach from state: %s",
                         self._attr_native_value,
                     )
                 except ValueError:
                     self._attr_native_value = None
-                    LOGGER.debug(
+                    self._log_debug(
                         "Invalid stored value for daysReach: %s", last_state.state
                     )
 
@@ -66,21 +66,21 @@ class DaysReachSensor(FoxInsightsEntity):
         data = self.coordinator.get_data(self.device)
         if data is None or data.daysReach is None:
             self._attr_native_value = None
-            LOGGER.debug("Data for daysReach not available")
+            self._log_debug("Data for daysReach not available")
         else:
             try:
                 self._attr_native_value = int(data.daysReach)
-                LOGGER.debug(
+                self._log_debug(
                     "Update daysReach for HWID %s with value: %s",
                     self.device.hwid,
                     self._attr_native_value,
                 )
             except ValueError:
-                LOGGER.debug(
+                self._log_debug(
                     "Invalid value for daysReach for HWID %s: %s",
                     self.device.hwid,
                     data.daysReach,
                 )
 
-        self.async_write_ha_state()
+        self._async_write_ha_state_if_changed()
         return None
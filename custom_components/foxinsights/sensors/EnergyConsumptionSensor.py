@@ -7,15 +7,16 @@ from homeassistant.const import STATE_UNAVAILABLE, UnitOfEnergy
 from homeassistant.core import callback
 
 from ..api import FoxInsightsDevice
-from ..const import LOGGER, NAME
+from ..const import NAME
 from ..coordinator import FoxInsightsDataUpdateCoordinator
-from ..entity import FoxInsightsEntity
+from ..entity import FoxInsightsConsumptionEntity
 
 
-class EnergyConsumptionSensor(FoxInsightsEntity):
-    """Sensor for the energy consumption."""
+class EnergyConsumptionSensor(FoxInsightsConsumptionEntity):
+    """Sensor for the energy consumption.
 
-    KWH_PER_L_HEATING_OIL_EXTRA_LIGHT = 10.08
+    The consumed quantity is converted with the fuel type which is resolved once per device.
+    """
 
     def __init__(
         self, coordinator: FoxInsightsDataUpdateCoordinator, device: FoxInsightsDevice
@@ -30,6 +31,8 @@ class EnergyConsumptionSensor(FoxInsightsEntity):
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
         self._attr_device_class = SensorDeviceClass.ENERGY
 
+        self._converter = coordinator.fuels.get_converter(device)
+
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         await super().async_added_to_hass()
@@ -41,35 +44,27 @@ class EnergyConsumptionSensor(FoxInsightsEntity):
 
             if last_sensor_data is not None:
                 self._attr_native_value = last_sensor_data.native_value
-                LOGGER.debug(
+                self._log_debug(
                     "Restored value for energyConsumption from data: %s",
                     self._attr_native_value,
                 )
             else:
                 try:
                     self._attr_native_value = float(last_state.state)
-                    LOGGER.debug(
+                    self._log_debug(
                         "Restored value for energyConsumption from state: %s",
                         self._attr_native_value,
                     )
                 except ValueError:
                     self._attr_native_value = None
-                    LOGGER.debug(
+                    self._log_debug(
                         "Invalid stored value for energyConsumption: %s",
                         last_state.state,
                     )
 
-            value = last_state.attributes.get("previous_value")
-            if value is None:
-                self._attr_extra_state_attributes["previous_value"] = 0
-            else:
-                self._attr_extra_state_attributes["previous_value"] = int(value)
+            await self.async_restore_consumption_values()
 
-            value = last_state.attributes.get("current_value")
-            if value is None:
-                self._attr_extra_state_attributes["current_value"] = 0
-            else:
-                self._attr_extra_state_attributes["current_value"] = int(value)
+        self._update_consumption_attributes()
 
         data = self.coordinator.get_data(self.device)
         if data is not None and data.fillLevelQuantity is not None:
@@ -83,47 +78,36 @@ class EnergyConsumptionSensor(FoxInsightsEntity):
         data = self.coordinator.get_data(self.device)
         if data is None or data.fillLevelQuantity is None:
             self._attr_native_value = 0.0
-            LOGGER.debug("Data for fillLevelQuantity not available")
+            self._log_debug("Data for fillLevelQuantity not available")
         else:
-            attributes = self._attr_extra_state_attributes
-            if "current_value" not in attributes or attributes["current_value"] is None:
-                attributes["current_value"] = 0.0
-
-            if (
-                "previous_value" not in attributes
-                or attributes["previous_value"] is None
-            ):
-                attributes["previous_value"] = 0.0
-
             try:
-                attributes["previous_value"] = attributes["current_value"]
-                attributes["current_value"] = int(data.fillLevelQuantity)
+                self._previous_value = self._current_value
+                self._current_value = int(data.fillLevelQuantity)
 
                 if self._attr_native_value is None:
                     self._attr_native_value = 0.0
 
-                if attributes["previous_value"] > attributes["current_value"]:
-                    diff = attributes["previous_value"] - attributes["current_value"]
+                if self._previous_value > self._current_value:
+                    diff = self._previous_value - self._current_value
                     self._attr_native_value = float(
-                        self._attr_native_value
-                        + (self.KWH_PER_L_HEATING_OIL_EXTRA_LIGHT * diff)
+                        self._attr_native_value + self._converter.convert(diff)
                     )
 
-                LOGGER.debug(
+                self._log_debug(
                     "Update energyConsumption for HWID %s with value: %s",
                     self.device.hwid,
                     self._attr_native_value,
                 )
             except ValueError:
-                LOGGER.debug(
+                self._log_debug(
                     "Invalid value for energyConsumption for HWID %s: %s",
                     self.device.hwid,
                     data.fillLevelQuantity,
                 )
 
-            self._attr_extra_state_attributes = attributes
+            self._update_consumption_attributes()
 
-        self.async_write_ha_state()
+        self._async_write_ha_state_if_changed()
         return None
 
     @property
@@ -0,0 +1,79 @@
+"""Sensor for the estimated fill level between meterings."""
+from __future__ import annotations
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import UnitOfMass, UnitOfVolume
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from ..api import FoxInsightsDevice
+from ..const import NAME
+from ..coordinator import FoxInsightsDataUpdateCoordinator
+from ..entity import FoxInsightsEntity
+from ..schema import parse_timestamp
+
+
+class EstimatedFillLevelSensor(FoxInsightsEntity):
+    """Sensor for the estimated fill level between meterings.
+
+    The fill level is extrapolated from the last metering with the locally computed consumption rate.
+    """
+
+    def __init__(
+        self, coordinator: FoxInsightsDataUpdateCoordinator, device: FoxInsightsDevice
+    ):
+        """Initialize."""
+        super().__init__(coordinator, device)
+
+        self._attr_unique_id = NAME + "-" + self.device.hwid + "-estimatedFillLevel"
+        self._attr_name = NAME + " " + self.device.hwid + " estimated fill level"
+        self._attr_icon = "mdi:hydraulic-oil-level"
+        self._attr_native_unit_of_measurement = UnitOfVolume.LITERS
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_device_class = SensorDeviceClass.VOLUME_STORAGE
+
+        if device.quantityUnit == "kg":
+            self._attr_native_unit_of_measurement = UnitOfMass.KILOGRAMS
+            self._attr_device_class = SensorDeviceClass.WEIGHT
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+
+        self.async_on_remove(
+            self.coordinator.async_add_estimate_listener(self._update_estimate)
+        )
+
+        data = self.coordinator.get_data(self.device)
+        if data is not None and data.fillLevelQuantity is not None:
+            self._update_estimate()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if not self.coordinator.needs_update(self.device):
+            return None
+
+        self._update_estimate()
+        return None
+
+    @callback
+    def _update_estimate(self) -> None:
+        """Extrapolate the fill level from the last metering and write the state."""
+        data = self.coordinator.get_data(self.device)
+        metering_at = None if data is None else parse_timestamp(data.currentMeteringAt)
+        if data is None or data.fillLevelQuantity is None or metering_at is None:
+            self._attr_native_value = None
+            self._log_debug("Data for estimatedFillLevel not available")
+        else:
+            rate = self.coordinator.detector.consumption_rate(self.device.hwid) or 0.0
+            days = max((dt_util.utcnow() - metering_at).total_seconds() / 86400, 0.0)
+            self._attr_native_value = max(
+                round(data.fillLevelQuantity - rate * days), 0
+            )
+            self._log_debug(
+                "Update estimatedFillLevel for HWID %s with value: %s",
+                self.device.hwid,
+                self._attr_native_value,
+            )
+
+        self._async_write_ha_state_if_changed()
@@ -7,7 +7,11 @@ from homeassistant.const import PERCENTAGE, STATE_UNAVAILABLE
 from homeassistant.core import callback
 
 from ..api import FoxInsightsDevice
-from ..const import LOGGER, NAME
+from ..const import (
+    CONF_DEADBAND_FILL_LEVEL_PERCENT,
+    DEFAULT_DEADBAND_FILL_LEVEL_PERCENT,
+    NAME,
+)
 from ..coordinator import FoxInsightsDataUpdateCoordinator
 from ..entity import FoxInsightsEntity
 
@@ -15,6 +19,9 @@ from ..entity import FoxInsightsEntity
 class FillLevelPercentSensor(FoxInsightsEntity):
     """Sensor for the fillLevelPercent property."""
 
+    _deadband_option = CONF_DEADBAND_FILL_LEVEL_PERCENT
+    _deadband_default = DEFAULT_DEADBAND_FILL_LEVEL_PERCENT
+
     def __init__(
         self, coordinator: FoxInsightsDataUpdateCoordinator, device: FoxInsightsDevice
     ):
@@ -39,20 +46,20 @@ class FillLevelPercentSensor(FoxInsightsEntity):
 
             if last_sensor_data is not None:
                 self._attr_native_value = last_sensor_data.native_value
-                LOGGER.debug(
+                self._log_debug(
                     "Restored value for fillLevelPercent from data: %s",
                     self._attr_native_value,
                 )
             else:
                 try:
                     self._attr_native_value = int(last_state.state)
-                    LOGGER.debug(
+                    self._log_debug(
                         "Restored value for fillLevelPercent from state: %s",
                         self._attr_native_value,
                     )
                 except ValueError:
                     self._attr_native_value = None
-                    LOGGER.debug(
+                    self._log_debug(
                         "Invalid stored value for fillLevelPercent: %s",
                         last_state.state,
                     )
@@ -69,21 +76,21 @@ class FillLevelPercentSensor(FoxInsightsEntity):
         data = self.coordinator.get_data(self.device)
         if data is None or data.fillLevelPercent is None:
             self._attr_native_value = None
-            LOGGER.debug("Data for fillLevelPercent not available")
+            self._log_debug("Data for fillLevelPercent not available")
         else:
             try:
                 self._attr_native_value = int(data.fillLevelPercent)
-                LOGGER.debug(
+                self._log_debug(
                     "Update fillLevelPercent for HWID %s with value: %s",
                     self.device.hwid,
                     self._attr_native_value,
                 )
             except ValueError:
-                LOGGER.debug(
+                self._log_debug(
                     "Invalid value for fillLevelPercent for HWID %s: %s",
                     self.device.hwid,
                     data.fillLevelPercent,
                 )
 
-        self.async_write_ha_state()
+        self._async_write_ha_state_if_changed()
         return None
@@ -6,7 +6,11 @@ from homeassistant.const import STATE_UNAVAILABLE, UnitOfMass, UnitOfVolume
 from homeassistant.core import callback
 
 from ..api import FoxInsightsDevice
-from ..const import LOGGER, NAME
+from ..const import (
+    CONF_DEADBAND_FILL_LEVEL_QUANTITY,
+    DEFAULT_DEADBAND_FILL_LEVEL_QUANTITY,
+    NAME,
+)
 from ..coordinator import FoxInsightsDataUpdateCoordinator
 from ..entity import FoxInsightsEntity
 
@@ -14,6 +18,9 @@ from ..entity import FoxInsightsEntity
 class FillLevelQuantitySensor(FoxInsightsEntity):
     """Sensor for the fillLevelQuantity property."""
 
+    _deadband_option = CONF_DEADBAND_FILL_LEVEL_QUANTITY
+    _deadband_default = DEFAULT_DEADBAND_FILL_LEVEL_QUANTITY
+
     def __init__(
         self, coordinator: FoxInsightsDataUpdateCoordinator, device: FoxInsightsDevice
     ):
@@ -42,20 +49,20 @@ class FillLevelQuantitySensor(FoxInsightsEntity):
 
             if last_sensor_data is not None:
                 self._attr_native_value = last_sensor_data.native_value
-                LOGGER.debug(
+                self._log_debug(
                     "Restored value for fillLevelQuantity from data: %s",
                     self._attr_native_value,
                 )
             else:
                 try:
                     self._attr_native_value = int(last_state.state)
-                    LOGGER.debug(
+                    self._log_debug(
                         "Restored value for fillLevelQuantity from state: %s",
                         self._attr_native_value,
                     )
                 except ValueError:
                     self._attr_native_value = None
-                    LOGGER.debug(
+                    self._log_debug(
                         "Invalid stored value for fillLevelQuantity: %s",
                         last_state.state,
                     )
@@ -72,21 +79,21 @@ class FillLevelQuantitySensor(FoxInsightsEntity):
         data = self.coordinator.get_data(self.device)
         if data is None or data.fillLevelQuantity is None:
             self._attr_native_value = None
-            LOGGER.debug("Data for fillLevelQuantity not available")
+            self._log_debug("Data for fillLevelQuantity not available")
         else:
             try:
                 self._attr_native_value = int(data.fillLevelQuantity)
-                LOGGER.debug(
+                self._log_debug(
                     "Update fillLevelQuantity for HWID %s with value: %s",
                     self.device.hwid,
                     self._attr_native_value,
                 )
             except ValueError:
-                LOGGER.debug(
+                self._log_debug(
                     "Invalid value for fillLevelQuantity for HWID %s: %s",
                     self.device.hwid,
                     data.fillLevelQuantity,
                 )
 
-        self.async_write_ha_state()
+        self._async_write_ha_state_if_changed()
         return None
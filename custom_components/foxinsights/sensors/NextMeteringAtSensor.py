@@ -7,7 +7,7 @@ from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.core import callback
 
 from ..api import FoxInsightsDevice
-from ..const import LOGGER, NAME
+from ..const import NAME
 from ..coordinator import FoxInsightsDataUpdateCoordinator
 from ..entity import FoxInsightsEntity
 
@@ -41,20 +41,20 @@ class NextMeteringAtSensor(FoxInsightsEntity):
 
             if last_sensor_data is not None:
                 self._attr_native_value = last_sensor_data.native_value
-                LOGGER.debug(
+                self._log_debug(
                     "Restored value for nextMeteringAt from data: %s",
                     self._attr_native_value,
                 )
             else:
                 try:
                     self._attr_native_value = datetime.fromisoformat(last_state.state)
-                    LOGGER.debug(
+                    self._log_debug(
                         "Restored value for nextMeteringAt from state: %s",
                         self._attr_native_value,
                     )
                 except ValueError:
                     self._attr_native_value = None
-                    LOGGER.debug(
+                    self._log_debug(
                         "Invalid stored value for nextMeteringAt: %s", last_state.state
                     )
 
@@ -70,21 +70,21 @@ class NextMeteringAtSensor(FoxInsightsEntity):
         data = self.coordinator.get_data(self.device)
         if data is None or data.nextMeteringAt is None:
             self._attr_native_value = None
-            LOGGER.debug("Data for nextMeteringAt not available")
+            self._log_debug("Data for nextMeteringAt not available")
         else:
             try:
                 self._attr_native_value = datetime.fromisoformat(data.nextMeteringAt)
-                LOGGER.debug(
+                self._log_debug(
                     "Update nextMeteringAt for HWID %s with value: %s",
                     self.device.hwid,
                     self._attr_native_value,
                 )
-            except KeyError:
-                LOGGER.debug(
+            except (TypeError, ValueError):
+                self._log_debug(
                     "Invalid value for nextMeteringAt for HWID %s: %s",
                     self.device.hwid,
                     data.nextMeteringAt,
                 )
 
-        self.async_write_ha_state()
+        self._async_write_ha_state_if_changed()
         return None
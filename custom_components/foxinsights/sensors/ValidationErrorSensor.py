@@ -5,7 +5,7 @@ from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.core import callback
 
 from ..api import FoxInsightsDevice
-from ..const import LOGGER, NAME
+from ..const import NAME
 from ..coordinator import FoxInsightsDataUpdateCoordinator
 from ..entity import FoxInsightsEntity
 
@@ -50,28 +50,31 @@ class ValidationErrorSensor(FoxInsightsEntity):
 
             if last_sensor_data is not None:
                 self._attr_native_value = last_sensor_data.native_value
-                LOGGER.debug(
+                self._log_debug(
                     "Restored value for validationError from data: %s",
                     self._attr_native_value,
                 )
             else:
                 try:
                     self._attr_native_value = str(last_state.state)
-                    LOGGER.debug(
+                    self._log_debug(
                         "Restored value for validationError from state: %s",
                         self._attr_native_value,
                     )
                 except ValueError:
                     self._attr_native_value = None
-                    LOGGER.debug(
+                    self._log_debug(
                         "Invalid stored value for validationError: %s", last_state.state
                     )
 
-        if self._attr_native_value not in self.validation_error_mapping:
-            self._attr_native_value = None
-            LOGGER.debug(
-                "Invalid stored value for validationError: %s", last_state.state
+        if (
+            self._attr_native_value is not None
+            and self._attr_native_value not in self.validation_error_mapping
+        ):
+            self._log_debug(
+                "Invalid stored value for validationError: %s", self._attr_native_value
             )
+            self._attr_native_value = None
 
         data = self.coordinator.get_data(self.device)
         if data is not None:
@@ -85,24 +88,24 @@ class ValidationErrorSensor(FoxInsightsEntity):
         data = self.coordinator.get_data(self.device)
         if data is None or data.validationError is None:
             self._attr_native_value = self.validation_error_mapping["NO_ERROR"]
-            LOGGER.debug("Data for validationError not available")
+            self._log_debug("Data for validationError not available")
         else:
             try:
                 self._attr_native_value = self.validation_error_mapping[
                     data.validationError
                 ]
-                LOGGER.debug(
+                self._log_debug(
                     "Update validationError for HWID %s with value: %s",
                     self.device.hwid,
                     self._attr_native_value,
                 )
             except KeyError:
                 self._attr_native_value = data.validationError
-                LOGGER.debug(
+                self._log_debug(
                     "Invalid value for validationError for HWID %s: %s",
                     self.device.hwid,
                     data.validationError,
                 )
 
-        self.async_write_ha_state()
+        self._async_write_ha_state_if_changed()
         return None
@@ -0,0 +1,89 @@
+"""Services for FoxInsights."""
+from __future__ import annotations
+
+import asyncio
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from . import async_import_modules
+from .const import ATTR_HWIDS, ATTR_REFRESHES, DOMAIN, SERVICE_PROFILE, SERVICE_REFRESH
+from .coordinator import FoxInsightsDataUpdateCoordinator
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_HWIDS): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_REFRESHES, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    if hass.services.has_service(DOMAIN, SERVICE_REFRESH):
+        return
+
+    async def async_refresh(call: ServiceCall) -> None:
+        """Refresh the given devices or all devices of all accounts."""
+        coordinators: list[FoxInsightsDataUpdateCoordinator] = list(
+            hass.data[DOMAIN].coordinators.values()
+        )
+
+        hwids = call.data.get(ATTR_HWIDS)
+        if not hwids:
+            await asyncio.gather(
+                *(coordinator.async_demand_refresh() for coordinator in coordinators)
+            )
+            return
+
+        unknown_hwids = set(hwids)
+        targets = {}
+        for coordinator in coordinators:
+            known_hwids = unknown_hwids & coordinator.update_datetime.keys()
+            if known_hwids:
+                targets[coordinator] = known_hwids
+                unknown_hwids -= known_hwids
+
+        if unknown_hwids:
+            raise ServiceValidationError(
+                "Unknown hardware IDs: " + ", ".join(sorted(unknown_hwids))
+            )
+
+        await asyncio.gather(
+            *(
+                coordinator.async_demand_refresh(known_hwids)
+                for coordinator, known_hwids in targets.items()
+            )
+        )
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Profile the next refreshes of all accounts."""
+        await async_import_modules(hass, [".profiler"])
+
+        from .profiler import FoxInsightsProfiler
+
+        hass.data[DOMAIN].profiler = FoxInsightsProfiler(
+            hass.config.path(DOMAIN + ".profile"), call.data[ATTR_REFRESHES]
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_refresh, schema=REFRESH_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA
+    )
+
+
+async def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services of the integration."""
+    hass.services.async_remove(DOMAIN, SERVICE_REFRESH)
+    hass.services.async_remove(DOMAIN, SERVICE_PROFILE)
@@ -0,0 +1,107 @@
+"""WebSocket API for FoxInsights."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import ATTR_HWIDS, DOMAIN, HISTORY_MAX_POINTS, WS_TYPE_HISTORY
+from .coordinator import FoxInsightsDataUpdateCoordinator
+from .history import FoxInsightsHistoryArchive
+from .rollup import PERIODS, aggregate_consumption
+from .scheduler import FoxInsightsPollScheduler
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the WebSocket commands of the integration."""
+    websocket_api.async_register_command(hass, websocket_history)
+
+
+def _query_history(
+    archive: FoxInsightsHistoryArchive,
+    hwids: list[str] | None,
+    start: int | None,
+    end: int | None,
+    max_points: int | None,
+    period: str | None,
+) -> dict[str, dict[str, list[int | None]]]:
+    """Read the history of the given devices and sum the consumption per period if a period is given.
+
+    Reads files and aggregates the whole range synchronously and must not be called from the event loop.
+
+    :param archive: The history archive to read.
+    :param hwids: The hardware IDs of the devices or None for all devices.
+    :param start: The earliest UNIX timestamp to return (optional).
+    :param end: The latest UNIX timestamp to return (optional).
+    :param max_points: The maximum number of meterings per device, ignored if a period is given (optional).
+    :param period: One of the PERIODS (optional).
+    :return: a dictionary mapping the hardware IDs to the columns of the meterings or periods.
+    """
+    if period is None:
+        return archive.query(hwids, start, end, max_points)
+
+    return {
+        hwid: aggregate_consumption(columns["t"], columns["quantity"], period)
+        for hwid, columns in archive.query(hwids, start, end).items()
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_HISTORY,
+        vol.Optional(ATTR_HWIDS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("start_time"): cv.datetime,
+        vol.Optional("end_time"): cv.datetime,
+        vol.Optional("max_points"): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=HISTORY_MAX_POINTS)
+        ),
+        vol.Optional("period"): vol.In(PERIODS),
+    }
+)
+@websocket_api.async_response
+async def websocket_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the fill level history of the given devices or all devices as columns.
+
+    Timestamps are returned as UNIX timestamps. Unknown fill level percentages are returned as null.
+    If a period is given, the consumption per period and its energy in kWh are returned instead of the meterings.
+    The history is read from the archives of all accounts and aggregated in the executor.
+    """
+    start = msg.get("start_time")
+    end = msg.get("end_time")
+    hwids = msg.get(ATTR_HWIDS)
+    period = msg.get("period")
+
+    scheduler: FoxInsightsPollScheduler | None = hass.data.get(DOMAIN)
+    coordinators: list[FoxInsightsDataUpdateCoordinator] = (
+        list(scheduler.coordinators.values()) if scheduler is not None else []
+    )
+
+    devices: dict[str, dict[str, Any]] = {}
+    for coordinator in coordinators:
+        history = await hass.async_add_executor_job(
+            _query_history,
+            coordinator.archive,
+            hwids,
+            int(start.timestamp()) if start is not None else None,
+            int(end.timestamp()) if end is not None else None,
+            msg.get("max_points"),
+            period,
+        )
+        for hwid, columns in history.items():
+            device = coordinator.data.get(hwid) if coordinator.data else None
+            columns["unit"] = device.quantityUnit if device is not None else None
+            if period is not None and device is not None:
+                columns["energy"] = coordinator.fuels.get_converter(
+                    device
+                ).convert_many(columns["consumption"])
+            devices[hwid] = columns
+
+    connection.send_result(msg["id"], {"devices": devices})
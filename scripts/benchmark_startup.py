@@ -0,0 +1,262 @@
+"""Startup benchmark for the FoxInsights integration.
+
+Reports the import time of the integration modules and the time to set up a config entry with a stubbed API for
+different device counts. Integration modules which are imported on the event loop during the first setup are listed,
+because imports block the event loop on file I/O. The API is stubbed by replaying a generated cassette, so no network access is needed.
+
+Usage: python3 scripts/benchmark_startup.py [--devices 1 10 100 1000] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.abc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import patch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "custom_components.foxinsights"
+IMPORT_TARGETS = [PACKAGE, PACKAGE + ".config_flow", PACKAGE + ".sensor"]
+
+
+class LoopImportRecorder(importlib.abc.MetaPathFinder):
+    """Finder which records the integration modules imported on the event loop without importing anything itself."""
+
+    def __init__(self) -> None:
+        """Initialize the object."""
+        self.modules: list[str] = []
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> None:
+        """Record the module if it is imported on the main thread, which runs the event loop."""
+        if (
+            fullname.startswith(PACKAGE)
+            and threading.current_thread() is threading.main_thread()
+        ):
+            self.modules.append(fullname)
+
+
+def measure_import(module: str) -> tuple[int, list[tuple[int, int, str]]]:
+    """Import a module in a fresh interpreter with -X importtime.
+
+    Home Assistant itself is imported first so that only the cost added by the module is measured.
+
+    :param module: The name of the module.
+    :return: The total import time in microseconds and the self time, cumulative time and name of each
+        imported module.
+    """
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import homeassistant.core, homeassistant.config_entries, sys; "
+            "print('--', file=sys.stderr); import " + module,
+        ],
+        cwd=ROOT,
+        env=os.environ | {"PYTHONPATH": ROOT},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    rows = []
+    for line in process.stderr.split("--\n", 1)[-1].splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        self_time, cumulative, name = line.removeprefix("import time:").split("|")
+        if not self_time.strip().isdigit():
+            continue
+
+        rows.append((int(self_time), int(cumulative), name.strip()))
+
+    total = sum(self_time for self_time, _, _ in rows)
+
+    return total, rows
+
+
+def generate_cassette(device_count: int) -> list[str]:
+    """Generate a cassette with a login and a list of devices.
+
+    :param device_count: The number of devices.
+    :return: The lines of the cassette.
+    """
+    now = datetime.now(timezone.utc)
+    items = [
+        {
+            "hwid": f"BENCH{index:06d}",
+            "currentMeteringAt": (now - timedelta(hours=1)).isoformat(),
+            "nextMeteringAt": (now + timedelta(hours=5)).isoformat(),
+            "daysReach": 100 + index % 50,
+            "validationError": "NO_ERROR",
+            "batteryLevel": "FULL",
+            "fillLevelPercent": 20 + index % 80,
+            "fillLevelQuantity": 1000 + index,
+            "quantityUnit": "L",
+        }
+        for index in range(device_count)
+    ]
+
+    # the login is replayed for every fetch, the device list is only fetched once during setup
+    lines = [
+        json.dumps(
+            {"t": 0, "d": 0, "m": "post", "u": "login", "s": 200, "b": body},
+            separators=(",", ":"),
+        )
+        for body in [{"access_token": "token", "refresh_token": "token"}] * 10
+    ]
+    lines.append(
+        json.dumps(
+            {
+                "t": 0,
+                "d": 0,
+                "m": "get",
+                "u": "device",
+                "s": 200,
+                "b": {"items": items},
+            },
+            separators=(",", ":"),
+        )
+    )
+
+    return lines
+
+
+async def measure_setup(device_count: int) -> dict[str, float]:
+    """Set up a config entry with a stubbed API in a minimal Home Assistant instance.
+
+    :param device_count: The number of devices returned by the stubbed API.
+    :return: The durations in seconds.
+    """
+    from homeassistant import bootstrap, config_entries, loader
+    from homeassistant.const import EVENT_STATE_CHANGED
+    from homeassistant.core import CoreState, HomeAssistant
+
+    from custom_components.foxinsights.cassette import FoxInsightsReplaySession
+    from custom_components.foxinsights.const import CONF_ACCOUNTS, CONF_EMAIL, DOMAIN
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.config.skip_pip = True
+        loader.async_setup(hass)
+
+        await bootstrap.load_registries(hass)
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+
+        # the WebSocket API only registers a command, there is no need to start the HTTP server
+        hass.config.components.update({"http", "websocket_api"})
+        hass.state = CoreState.running
+
+        first_state: list[float] = []
+        states = 0
+        expected_states = device_count * 9
+
+        def state_changed(event) -> None:
+            nonlocal states
+            if not event.data["entity_id"].startswith("sensor."):
+                return
+
+            states += 1
+            if not first_state:
+                first_state.append(time.perf_counter())
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, state_changed)
+
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Benchmark",
+            data={CONF_ACCOUNTS: [{CONF_EMAIL: "bench@example.com", "password": "x"}]},
+            source=config_entries.SOURCE_USER,
+            options={},
+        )
+
+        session = FoxInsightsReplaySession(generate_cassette(device_count))
+        with patch(PACKAGE + ".async_get_clientsession", return_value=session):
+            started_at = time.perf_counter()
+            await hass.config_entries.async_add(entry)
+            await hass.async_block_till_done()
+            finished_at = time.perf_counter()
+
+        result = {
+            "setup": finished_at - started_at,
+            "first_state": (first_state[0] - started_at)
+            if first_state
+            else float("nan"),
+            "states": states,
+        }
+
+        if states < expected_states:
+            print(f"  warning: only {states} of {expected_states} states were written")
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop(force=True)
+
+        return result
+
+
+def main() -> None:
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+
+    print("Import time (in addition to Home Assistant core)")
+    for module in IMPORT_TARGETS:
+        totals = []
+        rows: list[tuple[int, int, str]] = []
+        for _ in range(args.repeat):
+            total, rows = measure_import(module)
+            totals.append(total)
+
+        print(f"  {module}: {statistics.median(totals) / 1000:.1f} ms")
+        for self_time, _, name in sorted(rows, reverse=True)[: args.top]:
+            print(f"    {self_time / 1000:8.1f} ms  {name}")
+
+    print()
+    print("Setup with stubbed API (median)")
+    print(f"  {'devices':>8} {'setup':>10} {'first state':>12} {'states':>8}")
+    recorder = LoopImportRecorder()
+    sys.meta_path.insert(0, recorder)
+    cold_setup = None
+    for device_count in args.devices:
+        results = [asyncio.run(measure_setup(device_count)) for _ in range(args.repeat)]
+        if cold_setup is None:
+            cold_setup = results[0]["setup"]
+        print(
+            f"  {device_count:>8}"
+            f" {statistics.median(r['setup'] for r in results) * 1000:>8.1f}ms"
+            f" {statistics.median(r['first_state'] for r in results) * 1000:>10.1f}ms"
+            f" {results[-1]['states']:>8}"
+        )
+    sys.meta_path.remove(recorder)
+    # lookups of modules which do not exist, such as optional platforms, are not imports
+    loop_imports = [
+        module for module in dict.fromkeys(recorder.modules) if module in sys.modules
+    ]
+
+    print()
+    print(f"First setup including imports: {cold_setup * 1000:.1f}ms")
+    print(f"Integration modules imported on the event loop: {len(loop_imports)}")
+    for module in loop_imports:
+        print(f"  {module}")
+
+
+if __name__ == "__main__":
+    main()
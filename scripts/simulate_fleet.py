@@ -0,0 +1,572 @@
+"""Time-accelerated fleet simulator for the FoxInsights integration.
+
+Drives the real coordinator and sensor classes with synthetic tanks on a virtual clock. Tanks consume with daily
+variation, are refilled when they run low, report noisy fill levels, lose battery and suffer API outages. The
+integration is restarted periodically, restoring the sensors from their stored state like Home Assistant does.
+
+By default the state machine is left out: sensors record what they would write instead of writing it. With
+--recorder the states are written to the state machine and recorded in a SQLite database, and the recorded bytes
+per day are reported. --legacy-attributes records the bookkeeping attributes of the consumption sensors, as versions
+before they became unrecorded did. At the end the
+consumption totals computed by the sensors are compared with the true consumption of the tanks. Consumption in
+metering intervals which end with a refill cannot be observed and is left out. Devices which are off by more than
+--tolerance of the true consumption plus three times the reading noise are reported as divergent.
+
+With --rate-step the consumption rate of every tank is multiplied by the given factor halfway through the
+simulation. The report counts the suspected leaks and compares the consumption rates learned by the anomaly
+detector with the true rates, so that a detector which does not adapt to a lasting change shows up.
+
+Usage: python3 scripts/simulate_fleet.py [--devices 1000] [--days 365] [--interval-hours 24]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# pylint: disable=wrong-import-position
+from homeassistant import config_entries  # noqa: E402
+from homeassistant.core import HomeAssistant, State  # noqa: E402
+
+from custom_components.foxinsights.api import (  # noqa: E402
+    FoxInsightsApiConnectionError,
+    FoxInsightsDevice,
+)
+from custom_components.foxinsights.const import (  # noqa: E402
+    CONF_SHOW_CONSUMPTION_ATTRIBUTES,
+    DOMAIN,
+    EVENT_LEAK_SUSPECTED,
+)
+from custom_components.foxinsights.coordinator import (  # noqa: E402
+    FoxInsightsDataUpdateCoordinator,
+)
+from custom_components.foxinsights.history import (  # noqa: E402
+    FoxInsightsHistoryArchive,
+)
+from custom_components.foxinsights.sensors.BatteryLevelSensor import (  # noqa: E402
+    BatteryLevelSensor,
+)
+from custom_components.foxinsights.sensors.EnergyConsumptionSensor import (  # noqa: E402
+    EnergyConsumptionSensor,
+)
+from custom_components.foxinsights.sensors.FillLevelQuantitySensor import (  # noqa: E402
+    FillLevelQuantitySensor,
+)
+from custom_components.foxinsights.sensors.MaterialConsumptionSensor import (  # noqa: E402
+    MaterialConsumptionSensor,
+)
+
+RATE_TOLERANCE = 0.3
+
+BATTERY_LEVELS = ["FULL", "GOOD", "MEDIUM", "WARNING", "CRITICAL"]
+
+
+class VirtualClock:
+    """Clock which only advances when told to.
+
+    Replaces the wall clock of Home Assistant and the monotonic clock of the coordinator, so that full syncs and
+    archive compactions happen at their configured intervals in simulated time.
+    """
+
+    def __init__(self, now: datetime) -> None:
+        """Initialize the object."""
+        self.now = now
+
+    def utcnow(self) -> datetime:
+        """Return the virtual time."""
+        return self.now
+
+    def monotonic(self) -> float:
+        """Return the virtual time as a timestamp."""
+        return self.now.timestamp()
+
+
+@dataclass
+class SimulatedTank:
+    """Synthetic tank which is metered at a fixed interval."""
+
+    hwid: str
+    capacity: int
+    rate: float
+    noise: float
+    quantity: float
+    battery: float
+    metering_at: datetime
+    interval: timedelta
+    reported: int = 0
+    delivered: tuple[datetime, int] | None = None
+    expected_consumption: int = 0
+    true_consumption: float = 0.0
+    refill_consumption: float = 0.0
+    refills: int = 0
+
+    def __post_init__(self) -> None:
+        """Take the reading of the initial metering."""
+        self.reported = round(self.quantity)
+
+    def advance(self, now: datetime, rng: random.Random) -> int:
+        """Perform all meterings up to the given time.
+
+        :return: The number of meterings.
+        """
+        meterings = 0
+        while self.metering_at + self.interval <= now:
+            self.metering_at += self.interval
+            days = self.interval.total_seconds() / 86400
+
+            consumption = min(
+                max(rng.gauss(self.rate, self.rate * 0.3), 0) * days, self.quantity
+            )
+            self.quantity -= consumption
+            self.true_consumption += consumption
+
+            if self.quantity < self.capacity * 0.15 and rng.random() < 0.3:
+                self.quantity = self.capacity * rng.uniform(0.85, 0.95)
+                self.refills += 1
+                # the readings only show the net increase, the consumption before the refill is not observable
+                self.refill_consumption += consumption
+
+            self.reported = max(round(self.quantity + rng.gauss(0, self.noise)), 0)
+            self.battery = max(self.battery - rng.uniform(0, 0.002) * days, 0)
+            meterings += 1
+
+        return meterings
+
+    def deliver(self) -> FoxInsightsDevice:
+        """Return the device as reported by the API.
+
+        The expected consumption only counts readings which were delivered, because the coordinator never sees
+        meterings which were replaced by a newer one during an outage.
+        """
+        if self.delivered is not None and self.delivered[0] != self.metering_at:
+            self.expected_consumption += max(self.delivered[1] - self.reported, 0)
+        self.delivered = (self.metering_at, self.reported)
+
+        return FoxInsightsDevice(
+            hwid=self.hwid,
+            currentMeteringAt=self.metering_at.isoformat(),
+            nextMeteringAt=(self.metering_at + self.interval).isoformat(),
+            daysReach=round(self.quantity / self.rate) if self.rate > 0 else None,
+            validationError="NO_ERROR",
+            batteryLevel=BATTERY_LEVELS[
+                min(
+                    int((1 - self.battery) * len(BATTERY_LEVELS)),
+                    len(BATTERY_LEVELS) - 1,
+                )
+            ],
+            fillLevelPercent=round(self.reported * 100 / self.capacity),
+            fillLevelQuantity=self.reported,
+            quantityUnit="L",
+        )
+
+
+class SimulatedApi:
+    """Replacement for the API client which reports the simulated tanks."""
+
+    def __init__(self, tanks: dict[str, SimulatedTank]) -> None:
+        """Initialize the object."""
+        self.tanks = tanks
+        self.email = "simulator@example.com"
+        self.outage = False
+        self.requests = 0
+
+    async def async_get_data(self) -> dict[str, FoxInsightsDevice]:
+        """Return all devices."""
+        return self._get_devices(self.tanks)
+
+    async def async_get_devices(self, hwids) -> dict[str, FoxInsightsDevice]:
+        """Return the given devices."""
+        return self._get_devices([hwid for hwid in hwids if hwid in self.tanks])
+
+    def _get_devices(self, hwids) -> dict[str, FoxInsightsDevice]:
+        self.requests += 1
+        if self.outage:
+            raise FoxInsightsApiConnectionError("Simulated outage")
+
+        return {hwid: self.tanks[hwid].deliver() for hwid in hwids}
+
+
+class SimulatedSensorMixin:
+    """Mixin which records written states and restores from a snapshot instead of the state machine."""
+
+    restored_state: State | None = None
+    restored_extra: Any = None
+    write_states: bool = False
+    _no_platform_reported = True
+
+    def async_write_ha_state(self) -> None:
+        """Record the state instead of writing it, unless states are written to the recorder."""
+        if self.write_states:
+            super().async_write_ha_state()
+            return
+
+        self._written_state = self._render_state()
+        self.coordinator.state_writes_emitted += 1
+
+    async def async_get_last_state(self) -> State | None:
+        """Return the snapshot taken before the restart."""
+        return self.restored_state
+
+    async def async_get_last_extra_data(self) -> Any:
+        """Return the extra data taken before the restart."""
+        return self.restored_extra
+
+    def snapshot(self) -> tuple[State, Any]:
+        """Return the state and extra data which Home Assistant would store on shutdown."""
+        value = self.native_value
+        return (
+            State(self.entity_id, "unknown" if value is None else str(value)),
+            self.extra_restore_state_data,
+        )
+
+
+SENSOR_CLASSES = {
+    "fill_level_quantity": FillLevelQuantitySensor,
+    "battery_level": BatteryLevelSensor,
+    "material_consumption": MaterialConsumptionSensor,
+    "energy_consumption": EnergyConsumptionSensor,
+}
+
+
+def get_simulated_classes(
+    write_states: bool, legacy_attributes: bool
+) -> dict[str, type[SimulatedSensorMixin]]:
+    """Create the simulated sensor classes.
+
+    :param write_states: True to write the states to the state machine.
+    :param legacy_attributes: True to record the bookkeeping attributes of the consumption sensors.
+    :return: a dictionary mapping the sensor kinds to the classes.
+    """
+    classes = {}
+    for kind, cls in SENSOR_CLASSES.items():
+        namespace: dict[str, Any] = {"write_states": write_states}
+        if legacy_attributes:
+            namespace["_unrecorded_attributes"] = frozenset()
+
+        classes[kind] = type(
+            "Simulated" + cls.__name__, (SimulatedSensorMixin, cls), namespace
+        )
+
+    return classes
+
+
+async def async_start(
+    hass: HomeAssistant,
+    entry: config_entries.ConfigEntry,
+    api: SimulatedApi,
+    archive: FoxInsightsHistoryArchive,
+    classes: dict[str, type[SimulatedSensorMixin]],
+    snapshots: dict[tuple[str, str], tuple[State, Any]],
+) -> tuple[FoxInsightsDataUpdateCoordinator, dict[tuple[str, str], Any]]:
+    """Start the integration: create the coordinator, refresh and add the sensors with restored state."""
+    config_entries.current_entry.set(entry)
+    coordinator = FoxInsightsDataUpdateCoordinator(hass, [api], archive)
+    await coordinator.async_refresh()
+
+    sensors = {}
+    for device in coordinator.data.values():
+        for kind, cls in classes.items():
+            sensor = cls(coordinator, device)
+            sensor.hass = hass
+            sensor.entity_id = "sensor." + device.hwid.lower() + "_" + kind
+            # normally set when the platform adds the entity
+            sensor._state_info = {  # pylint: disable=protected-access
+                "unrecorded_attributes": cls._Entity__combined_unrecorded_attributes  # pylint: disable=protected-access
+            }
+            snapshot = snapshots.get((device.hwid, kind))
+            if snapshot is not None:
+                sensor.restored_state, sensor.restored_extra = snapshot
+            await sensor.async_added_to_hass()
+            sensors[(device.hwid, kind)] = sensor
+
+    return coordinator, sensors
+
+
+async def async_setup_recorder(hass: HomeAssistant, database: str) -> None:
+    """Set up the recorder with a SQLite database which commits every state immediately.
+
+    :param hass: The Home Assistant instance.
+    :param database: The path of the database.
+    """
+    # the recorder has requirements of its own, which are only needed with --recorder
+    from homeassistant.components.recorder import get_instance
+    from homeassistant import bootstrap, loader
+    from homeassistant.helpers.recorder import async_initialize_recorder
+    from homeassistant.setup import async_setup_component
+
+    loader.async_setup(hass)
+    await bootstrap.load_registries(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    async_initialize_recorder(hass)
+    hass.config.skip_pip = True
+    assert await async_setup_component(
+        hass,
+        "recorder",
+        {"recorder": {"db_url": "sqlite:///" + database, "commit_interval": 0}},
+    )
+    await hass.async_start()
+    await get_instance(hass).async_block_till_done()
+
+
+async def async_measure_recorder(hass: HomeAssistant, database: str) -> dict[str, int]:
+    """Measure the rows and bytes which the states of the sensors added to the recorder database.
+
+    The bytes are the page space of the states and state_attributes tables including their indexes.
+
+    :param hass: The Home Assistant instance.
+    :param database: The path of the database.
+    :return: The number of state rows, attribute rows, bytes and bytes in attributes.
+    """
+    from homeassistant.components.recorder import get_instance
+
+    await get_instance(hass).async_block_till_done()
+
+    def measure() -> dict[str, int]:
+        with sqlite3.connect(database) as connection:
+            states = connection.execute(
+                "SELECT COUNT(*) FROM states WHERE metadata_id IN "
+                "(SELECT metadata_id FROM states_meta WHERE entity_id LIKE 'sensor.sim%')"
+            ).fetchone()[0]
+            attributes = connection.execute(
+                "SELECT COUNT(*) FROM state_attributes"
+            ).fetchone()[0]
+            table_bytes = dict(
+                connection.execute(
+                    "SELECT tbl_name, SUM(pgsize) FROM dbstat JOIN sqlite_master ON dbstat.name = sqlite_master.name "
+                    "WHERE tbl_name IN ('states', 'state_attributes') GROUP BY tbl_name"
+                )
+            )
+
+        return {
+            "states": states,
+            "attributes": attributes,
+            "bytes": sum(table_bytes.values()),
+            "attribute_bytes": table_bytes.get("state_attributes", 0),
+        }
+
+    return await hass.async_add_executor_job(measure)
+
+
+async def async_simulate(args: argparse.Namespace) -> None:
+    """Run the simulation and print a report."""
+    rng = random.Random(args.seed)
+    start = datetime(2024, 9, 1, tzinfo=timezone.utc)
+    clock = VirtualClock(start)
+    interval = timedelta(hours=args.interval_hours)
+
+    tanks = {}
+    for index in range(args.devices):
+        capacity = rng.choice([1500, 3000, 5000, 8000])
+        tanks[f"SIM{index:06d}"] = SimulatedTank(
+            hwid=f"SIM{index:06d}",
+            capacity=capacity,
+            rate=capacity * rng.uniform(0.001, 0.006),
+            noise=args.noise,
+            quantity=capacity * rng.uniform(0.3, 0.95),
+            battery=rng.uniform(0.6, 1.0),
+            metering_at=start - interval * rng.random(),
+            interval=interval,
+        )
+
+    api = SimulatedApi(tanks)
+
+    with tempfile.TemporaryDirectory() as config_dir, patch(
+        "homeassistant.util.dt.utcnow", clock.utcnow
+    ), patch(
+        "custom_components.foxinsights.coordinator.time",
+        SimpleNamespace(monotonic=clock.monotonic),
+    ):
+        hass = HomeAssistant(config_dir)
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Simulator",
+            data={},
+            source=config_entries.SOURCE_USER,
+            options={CONF_SHOW_CONSUMPTION_ATTRIBUTES: args.legacy_attributes},
+        )
+        archive = FoxInsightsHistoryArchive(os.path.join(config_dir, "history"))
+        classes = get_simulated_classes(args.recorder, args.legacy_attributes)
+
+        database = os.path.join(config_dir, "recorder.db")
+        if args.recorder:
+            await async_setup_recorder(hass, database)
+
+        for tank in tanks.values():
+            tank.advance(start, rng)
+
+        leaks = 0
+
+        def count_leak(_event: Any) -> None:
+            nonlocal leaks
+            leaks += 1
+
+        hass.bus.async_listen(EVENT_LEAK_SUSPECTED, count_leak)
+
+        coordinator, sensors = await async_start(hass, entry, api, archive, classes, {})
+
+        started_at = time.perf_counter()
+        steps = int(timedelta(days=args.days) / interval)
+        meterings = outages = restarts = 0
+        writes_emitted = writes_suppressed = 0
+
+        for step in range(1, steps + 1):
+            clock.now = start + step * interval
+            if args.rate_step != 1 and step == steps // 2:
+                for tank in tanks.values():
+                    tank.rate *= args.rate_step
+
+            for tank in tanks.values():
+                meterings += tank.advance(clock.now, rng)
+
+            api.outage = rng.random() < args.outage_probability
+            outages += api.outage
+
+            if (
+                args.restart_days
+                and step % int(timedelta(days=args.restart_days) / interval) == 0
+            ):
+                snapshots = {key: sensor.snapshot() for key, sensor in sensors.items()}
+                writes_emitted += coordinator.state_writes_emitted
+                writes_suppressed += coordinator.state_writes_suppressed
+                api.outage = False
+                coordinator, sensors = await async_start(
+                    hass, entry, api, archive, classes, snapshots
+                )
+                restarts += 1
+            else:
+                await coordinator.async_refresh()
+
+        # a final refresh without outage so that every sensor has seen the last metering
+        api.outage = False
+        await coordinator.async_refresh()
+        elapsed = time.perf_counter() - started_at
+        writes_emitted += coordinator.state_writes_emitted
+        writes_suppressed += coordinator.state_writes_suppressed
+
+        await hass.async_block_till_done()
+        learned_rates = {
+            hwid: coordinator.detector.consumption_rate(hwid) for hwid in tanks
+        }
+        recorded = None
+        if args.recorder:
+            recorded = await async_measure_recorder(hass, database)
+
+        await hass.async_stop(force=True)
+
+    divergences = []
+    total_expected = total_computed = total_true = total_refill = 0.0
+    for hwid, tank in tanks.items():
+        computed = sensors[(hwid, "material_consumption")].native_value or 0
+        total_expected += tank.expected_consumption
+        total_computed += computed
+        total_true += tank.true_consumption
+        total_refill += tank.refill_consumption
+
+        # the first and last reading may each be off by the noise
+        observable = tank.true_consumption - tank.refill_consumption
+        if abs(computed - observable) > args.tolerance * observable + 3 * args.noise:
+            divergences.append((hwid, observable, computed, tank.refills))
+
+    print(f"Simulated {args.days} days of {args.devices} devices in {elapsed:.2f}s")
+    print(f"  meterings:        {meterings} ({meterings / elapsed:,.0f}/s)")
+    print(f"  refreshes:        {steps + 1} ({restarts} restarts, {outages} outages)")
+    print(f"  API requests:     {api.requests}")
+    print(
+        f"  state writes:     {writes_emitted} emitted, {writes_suppressed} suppressed"
+    )
+    print(
+        f"  consumption:      expected {total_expected:,.0f}, computed {total_computed:,.0f}, true {total_true:,.0f} "
+        f"({total_refill:,.0f} in intervals with a refill)"
+    )
+    if recorded is not None:
+        print(
+            f"  recorder:         {recorded['states']} state rows, {recorded['attributes']} attribute rows, "
+            f"{recorded['bytes'] / args.days:,.0f} bytes per day "
+            f"({recorded['attribute_bytes'] / args.days:,.0f} in attributes)"
+        )
+    accurate_rates = sum(
+        1
+        for hwid, tank in tanks.items()
+        if learned_rates[hwid] is not None
+        and abs(learned_rates[hwid] - tank.rate) <= RATE_TOLERANCE * tank.rate
+    )
+    print(f"  suspected leaks:  {leaks}")
+    print(
+        f"  learned rates:    {accurate_rates} of {len(tanks)} within {RATE_TOLERANCE:.0%} of the true rate"
+    )
+    print(
+        f"  divergent devices: {len(divergences)} (computed off by more than {args.tolerance:.0%} of the true "
+        f"consumption outside refill intervals plus {3 * args.noise:g})"
+    )
+    for hwid, true, computed, refills in divergences[: args.top]:
+        print(
+            f"    {hwid}: true {true:,.0f} outside refill intervals, computed {computed}, refills {refills}"
+        )
+
+
+def main() -> None:
+    """Parse the arguments and run the simulation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--interval-hours", type=float, default=24)
+    parser.add_argument(
+        "--noise",
+        type=float,
+        default=3.0,
+        help="standard deviation of reported fill levels",
+    )
+    parser.add_argument("--outage-probability", type=float, default=0.02)
+    parser.add_argument(
+        "--restart-days", type=int, default=30, help="0 to never restart"
+    )
+    parser.add_argument(
+        "--recorder",
+        action="store_true",
+        help="write the states to a recorder database and report its growth",
+    )
+    parser.add_argument(
+        "--legacy-attributes",
+        action="store_true",
+        help="record the bookkeeping attributes of the consumption sensors",
+    )
+    parser.add_argument(
+        "--rate-step",
+        type=float,
+        default=1.0,
+        help="factor applied to the consumption rates halfway through the simulation",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.02,
+        help="relative deviation from the true consumption above which a device counts as divergent",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--top", type=int, default=10)
+
+    # outages are expected and counted in the report
+    logging.basicConfig(level=logging.ERROR)
+
+    asyncio.run(async_simulate(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()